@@ -15,6 +15,18 @@ import json
 import yaml
 from typing import Dict, Any, List
 
+from pet_clock import FrameClock, FrameGovernor, TimerRegistry
+from pet_input import CursorPoller, PointerSampler, WindowDrag
+from pet_motion import (
+    DEFAULT_MOTION, AnimationClock, BlinkSchedule, CriticalSpring, MotionMixer, compile_motion_spec, zzz_count
+)
+from pet_particles import ParticleLayer
+from pet_render import (
+    SpriteAtlas, SpriteDiskCache, RenderState, FrameCompositor, CrossfadeCache, RenderWorker, AlphaMask,
+    AtlasRenderer, CompositeRenderer, VectorPetRenderer,
+    DEFAULT_APPEARANCE, compile_face_spec, render_sprite_frames, render_tray_icon, snap_pupil
+)
+
 class ConfigLoader:
     def __init__(self, config_dir: str = "config"):
         self.config_dir = config_dir
@@ -59,7 +71,35 @@ class ConfigLoader:
                     'y': 'bottom-100'
                 },
                 'eye_tracking': {
-                    'max_radius': 3
+                    'max_radius': 3,
+                    'global': True,
+                    'spring_frequency': 18,
+                    'poll_min': 33,
+                    'poll_max': 1000
+                },
+                'frame_rate': {
+                    'active': 33,
+                    'awake': 100,
+                    'idle': 250,
+                    'sleepy': 1000,
+                    'hidden': 0,
+                    'idle_after': 10
+                },
+                'render': {
+                    'mode': 'atlas',
+                    'photo_cache_size': 160,
+                    'supersample': 4,
+                    'transfer': 'paste',
+                    'crossfade_ms': 300,
+                    'crossfade_steps': 6,
+                    'worker': True,
+                    'disk_cache': True,
+                    'cache_dir': ''
+                },
+                'particles': {
+                    'capacity': 24,
+                    'max_calls': 32,
+                    'zzz_interval': 1.5
                 }
             },
             'messages': {
@@ -78,6 +118,22 @@ class ConfigLoader:
         """获取主配置"""
         return self.configs['main'] or self._get_default_configs()['main']
 
+    def get_appearance_config(self) -> Dict[str, Any]:
+        """获取外观描述（文件加载失败时使用内置的外观）"""
+        try:
+            return self._load_config('appearance.yaml')
+        except Exception as e:
+            print(f"加载外观描述失败，使用内置外观: {e}")
+            return DEFAULT_APPEARANCE
+
+    def get_motion_config(self) -> Dict[str, Any]:
+        """获取动作描述（文件加载失败时使用内置的动作）"""
+        try:
+            return self._load_config('motion.yaml')
+        except Exception as e:
+            print(f"加载动作描述失败，使用内置动作: {e}")
+            return DEFAULT_MOTION
+
     def get_messages_config(self) -> Dict[str, List[str]]:
         """获取消息配置"""
         return self.configs['messages'] or self._get_default_configs()['messages']
@@ -85,28 +141,45 @@ class ConfigLoader:
 
 
 class DesktopPet:
+    # 设计尺寸下的窗口宽度，此时精灵为80x80
+    DESIGN_PET_SIZE = 100
+    # 眨眼配置的计数单位（秒）
+    BLINK_STEP = 0.05
+
     def __init__(self):
 
         self.config_loader = ConfigLoader()
         self.configs = self.config_loader.load_all_configs()
         self.main_config = self.config_loader.get_main_config()
         self.messages_config = self.config_loader.get_messages_config()
+        # 外观描述只在启动时编译一次
+        self.face_spec = compile_face_spec(self.config_loader.get_appearance_config())
+        # 动作轨道在加载时预计算为查找表
+        self.motion = MotionMixer(compile_motion_spec(self.config_loader.get_motion_config()))
 
         self.root = tk.Tk()
         self.root.title("桌面宠物")
         self.root.overrideredirect(True)  # 移除窗口边框
         self.root.attributes('-topmost', True)  # 始终置顶
         self.root.attributes('-transparentcolor', 'white')  # 设置透明色
+        # 所有周期任务都挂在同一个帧时钟上，一次性任务按名字登记
+        self.frame_clock = FrameClock(self.root)
+        self.timers = TimerRegistry(self.root)
 
-        # 从配置中获取窗口大小
+        # 从配置中获取窗口大小（按显示器DPI缩放）
         pet_config = self.main_config.get('pet', {})
-        self.pet_size = pet_config.get('size', 100)
-        self.total_height = pet_config.get('total_height', 150)  # 增加高度来容纳对话框
+        self.base_pet_size = pet_config.get('size', 100)
+        self.base_total_height = pet_config.get('total_height', 150)  # 增加高度来容纳对话框
+        self.dpi_scale = self.get_dpi_scale()
+        self.pet_size = round(self.base_pet_size * self.dpi_scale)
+        self.total_height = round(self.base_total_height * self.dpi_scale)
         self.root.geometry(f"{self.pet_size}x{self.total_height}")
         
         # 获取屏幕尺寸并设置初始位置（右下角）
         screen_width = self.root.winfo_screenwidth()
         screen_height = self.root.winfo_screenheight()
+        # 缓存屏幕尺寸，拖拽时不再逐个事件查询
+        self.screen_size = (screen_width, screen_height)
         # 解析初始位置配置
         pos_config = self.main_config.get('initial_position', {})
         x_pos = pos_config.get('x', 'right-50')
@@ -129,9 +202,10 @@ class DesktopPet:
         # 宠物状态
         self.emotions = ['normal', 'happy', 'sleepy', 'excited', 'thinking', 'curious']
         self.current_emotion = 'normal'  # 初始状态为正常
+        self.motion.set_emotion(self.current_emotion)
         self.is_dragging = False
-        self.drag_start_x = 0
-        self.drag_start_y = 0
+        # 拖拽时本地记录窗口位置，每帧最多移动一次窗口
+        self.window_drag = WindowDrag(self.root)
         
         # 从配置中获取时间相关参数
         self.last_interaction_time = time.time()
@@ -143,6 +217,43 @@ class DesktopPet:
         self.mouse_over = False  # 追踪鼠标是否在宠物上方
         self.mouse_x = 0  # 鼠标相对于宠物的X坐标
         self.mouse_y = 0  # 鼠标相对于宠物的Y坐标
+        self.last_mouse_move_time = time.time()  # 上次鼠标在宠物上移动的时间
+        # 移动事件只记下最新坐标，由帧时钟每帧采样一次
+        self.pointer = PointerSampler()
+        eye_config = self.main_config.get('eye_tracking', {})
+        self.eye_max_radius = eye_config.get('max_radius', 3)
+        # 眼睛跟随屏幕上任意位置的光标：移动时快速轮询，静止时逐渐放慢
+        self.cursor_poller = None
+        if eye_config.get('global', True):
+            self.cursor_poller = CursorPoller(self.root, eye_config.get('poll_min', 33), eye_config.get('poll_max', 1000))
+        self._last_eye_input = None  # 上次计算眼球位置时的输入
+        # 眼球由临界阻尼弹簧平滑地追向目标，收敛后不再计算
+        self.pupil_spring = CriticalSpring(eye_config.get('spring_frequency', 18))
+
+        # 渲染状态：只有变化时才推送给Tk
+        render_config = self.main_config.get('render', {})
+        self.render_mode = render_config.get('mode', 'atlas')  # atlas、vector 或 composite
+        # 渲染好的精灵按内容哈希缓存在用户缓存目录里
+        self.sprite_cache = None
+        if render_config.get('disk_cache', True):
+            self.sprite_cache = SpriteDiskCache(render_config.get('cache_dir') or None)
+        self.render_state = RenderState()
+        self.render_stats = {'sprite_updates': 0, 'coords_updates': 0}
+        # 表情切换的淡入淡出：(原表情, 新表情, 开始的动画时间)
+        self.crossfade_time = render_config.get('crossfade_ms', 300) / 1000
+        self.crossfade_steps = render_config.get('crossfade_steps', 6)
+        self.transition = None
+        # 逐帧合成时由后台线程提前合成预测的下一帧
+        self.use_render_worker = render_config.get('worker', True)
+        self.render_worker = None
+        self._prev_mouse = (0, 0)  # 上一帧的鼠标位置，用来外推下一帧
+
+        # 粒子效果：容量和每帧的Tk调用数都有上限
+        particle_config = self.main_config.get('particles', {})
+        self.particle_capacity = particle_config.get('capacity', 24)
+        self.particle_max_calls = particle_config.get('max_calls', 32)
+        self.zzz_interval = particle_config.get('zzz_interval', 1.5)  # 困倦时每隔几秒飘出一个z（0为关闭）
+        self.next_zzz_time = 0.0
 
         # 说话相关
         self.is_speaking = False
@@ -151,8 +262,31 @@ class DesktopPet:
         self.talk_messages = self.messages_config
         
         # 动画相关
-        self.animation_frame = 0
+        # 动画时间基准，隐藏到托盘时暂停
+        self.animation_clock = AnimationClock()
         self.animation_speed = pet_config.get('animation_speed', 500)  # 毫秒
+
+        # 眨眼相关（配置以50ms为单位）
+        blink_interval_min = pet_config.get('blink_interval_min', 80)
+        blink_interval_max = pet_config.get('blink_interval_max', 150)
+        blink_duration = pet_config.get('blink_duration', 8)
+        self.blink_schedule = BlinkSchedule(
+            (blink_interval_min * self.BLINK_STEP, blink_interval_max * self.BLINK_STEP),
+            blink_duration * self.BLINK_STEP,
+            self.animation_clock.now()
+        )
+        self.is_blinking = False
+
+        # 自适应帧率：有人看着时跑得快，没人看时降频，隐藏时停止
+        frame_config = self.main_config.get('frame_rate', {})
+        self.idle_after = frame_config.get('idle_after', 10)  # 鼠标和交互静止多少秒后降为idle档
+        self.frame_governor = FrameGovernor(self.frame_clock, {
+            'active': frame_config.get('active', 33),
+            'awake': frame_config.get('awake', 100),
+            'idle': frame_config.get('idle', 250),
+            'sleepy': frame_config.get('sleepy', 1000),
+            'hidden': frame_config.get('hidden', 0),
+        }, self.select_frame_level)
         
         # 摸鱼提醒器进程
         self.fish_reminder_process = None
@@ -168,18 +302,24 @@ class DesktopPet:
         self.create_widgets()
         self.bind_events()
         self.start_tray_icon()  # 启动托盘图标
-        self.start_animation()
         self.start_behavior_monitoring()  # 启动行为监控
+        # 注册顺序就是每一帧里的执行顺序：先决定状态，最后推送画面
+        self.start_pointer_sampling()
+        self.start_drag_tracking()
+        self.start_animation()
+        self.start_cursor_polling()
         self.start_eye_tracking()  # 启动眼球追踪
+        self.start_particles()
+        self.frame_clock.start()
         
         # 启动后说一句问候语
-        self.root.after(1000, lambda: self.say_random_message('greeting'))
+        self.timers.schedule('greeting', 1000, lambda: self.say_random_message('greeting'))
 
 
     def calculate_eye_position(self, eye_center_x, eye_center_y, mouse_x, mouse_y):
         """计算眼球位置"""
         # 眼球移动的最大半径
-        max_radius = 3
+        max_radius = self.eye_max_radius
         
         # 计算鼠标相对于眼睛中心的位置
         dx = mouse_x - eye_center_x
@@ -199,406 +339,275 @@ class DesktopPet:
         
         return eye_center_x + dx, eye_center_y + dy
 
+    def get_dpi_scale(self):
+        """获取当前显示器相对96 DPI的缩放倍数"""
+        return round(self.root.winfo_fpixels('1i') / 96, 2)
+
+    def get_sprite_scale(self):
+        """精灵相对设计尺寸的缩放倍数（设计尺寸下窗口宽100，精灵80x80）"""
+        return round(self.pet_size / self.DESIGN_PET_SIZE, 3)
+
+    def get_sprite_set(self, scale):
+        """获取某个缩放倍数下的全部精灵（每个缩放倍数只渲染一次）"""
+        sprite_set = self.sprite_sets.get(scale)
+        if sprite_set is not None:
+            return sprite_set
+
+        render_config = self.main_config.get('render', {})
+        supersample = render_config.get('supersample', 4)
+        spec = self.face_spec.scaled(scale)
+        frames = None
+        if self.sprite_cache is not None:
+            # 热启动时一次读入磁盘上的精灵表，免去整套渲染
+            cache_key = self.sprite_cache.key(spec, self.render_mode, self.emotions, self.eye_max_radius, supersample)
+            frames = self.sprite_cache.load(cache_key)
+        if frames is None:
+            frames = render_sprite_frames(spec, self.emotions, self.render_mode, self.eye_max_radius, supersample)
+            if self.sprite_cache is not None:
+                self.sprite_cache.store(cache_key, frames)
+
+        sprite_set = {'spec': spec}
+        if self.render_mode == 'atlas':
+            # 预渲染所有状态的精灵图集，逐帧只需查表
+            sprite_set['atlas'] = SpriteAtlas(
+                spec,
+                self.emotions,
+                self.eye_max_radius,
+                render_config.get('photo_cache_size', 160),
+                supersample
+            ).build(frames)
+        elif self.render_mode == 'composite':
+            compositor = FrameCompositor(spec, supersample)
+            compositor.base_layers.update({key: frame for key, frame in frames.items() if len(key) == 2})
+            sprite_set['compositor'] = compositor
+        elif self.render_mode == 'vector':
+            sprite_set['base_photos'] = {
+                (emotion, z_count): ImageTk.PhotoImage(frames[(emotion, z_count)])
+                for emotion in self.emotions
+                for z_count in range(spec.z_frames(emotion))
+            }
+        # 表情的默认图像（眼睛看向正前方）
+        sprite_set['still'] = {
+            emotion: frames[spec.normalize_key(emotion, False, (0, 0), 0)]
+            for emotion in self.emotions
+        }
+        # 表情切换的过渡帧，每对表情第一次切换时混合并缓存
+        sprite_set['crossfade'] = CrossfadeCache(sprite_set['still'], self.crossfade_steps)
+        # 命中测试用的透明度位图，每个表情一张
+        sprite_set['masks'] = {emotion: AlphaMask(image) for emotion, image in sprite_set['still'].items()}
+        self.sprite_sets[scale] = sprite_set
+        return sprite_set
+
     def create_pet_images(self):
         """创建不同表情的宠物图像"""
         self.pet_images = {}
+        self.sprite_sets = {}
+        self.sprite_scale = self.get_sprite_scale()
+        sprite_set = self.get_sprite_set(self.sprite_scale)
         
         for emotion in self.emotions:
-            # 创建图像
-            img = Image.new('RGBA', (80, 80), (255, 255, 255, 0))
-            draw = ImageDraw.Draw(img)
-            
-            if emotion == 'normal':
-                # 普通表情 - 绿色圆形身体
-                draw.ellipse([10, 20, 70, 70], fill='#4CAF50', outline='#2E7D32', width=2)
-                # 眼睛白色部分
-                draw.ellipse([25, 30, 35, 40], fill='#FFFEFA', outline='black')
-                draw.ellipse([45, 30, 55, 40], fill='#FFFEFA', outline='black')
-                # 嘴巴
-                draw.arc([35, 45, 45, 55], 0, 180, fill='black', width=2)
-
-                # 保存为PNG文件
-                def save_and_reload(img, filename="pet_normal.png"):
-                    img.save(filename, format="PNG")
-                    reloaded_img = Image.open(filename)
-                    return ImageTk.PhotoImage(reloaded_img)
-                self.pet_images[emotion] = save_and_reload(img)
-                continue  # 跳过后续的赋值，已处理
-
-            elif emotion == 'happy':
-                # 开心表情 - 黄色身体
-                draw.ellipse([10, 20, 70, 70], fill='#FFC107', outline='#FF8F00', width=2)
-                # 眼睛白色部分
-                draw.ellipse([25, 30, 35, 40], fill='#FFFEFA', outline='black')
-                draw.ellipse([45, 30, 55, 40], fill='#FFFEFA', outline='black')
-                # 开心的嘴巴
-                draw.arc([30, 40, 50, 60], 0, 180, fill='black', width=3)
-
-            elif emotion == 'sleepy':
-                # 困倦表情 - 蓝色身体
-                draw.ellipse([10, 20, 70, 70], fill='#2196F3', outline='#0D47A1', width=2)
-                # 困倦的眼睛（闭着的）
-                draw.ellipse([25, 33, 35, 37], fill='#FFFEFA', outline='black')
-                draw.ellipse([45, 33, 55, 37], fill='#FFFEFA', outline='black')
-                draw.line([25, 35, 35, 35], fill='black', width=2)
-                draw.line([45, 35, 55, 35], fill='black', width=2)
-                # 小嘴巴
-                draw.ellipse([38, 48, 42, 52], fill='black')
-                # Z字符表示睡觉
-                draw.text((55, 15), "Z", fill='black')
-
-            elif emotion == 'excited':
-                # 兴奋表情 - 红色身体
-                draw.ellipse([10, 20, 70, 70], fill='#F44336', outline='#B71C1C', width=2)
-                # 大眼睛白色部分
-                draw.ellipse([20, 25, 35, 40], fill='#FFFEFA', outline='black')
-                draw.ellipse([45, 25, 60, 40], fill='#FFFEFA', outline='black')
-                # 兴奋的嘴巴
-                draw.ellipse([35, 45, 45, 55], fill='black')
-
-            elif emotion == 'thinking':
-                # 思考表情 - 紫色身体
-                draw.ellipse([10, 20, 70, 70], fill='#9C27B0', outline='#4A148C', width=2)
-                # 眼睛白色部分（向上看）
-                draw.ellipse([25, 30, 35, 40], fill='#FFFEFA', outline='black')
-                draw.ellipse([45, 30, 55, 40], fill='#FFFEFA', outline='black')
-                # 思考的嘴巴
-                draw.arc([35, 50, 45, 55], 0, 180, fill='black', width=2)
-                # 思考泡泡
-                draw.ellipse([55, 10, 65, 20], fill='white', outline='black')
-                draw.text((57, 12), "?", fill='black')
-                
-            elif emotion == 'curious':
-                # 好奇表情 - 橙色身体
-                draw.ellipse([10, 20, 70, 70], fill='#FF9800', outline='#E65100', width=2)
-                # 好奇的大眼睛白色部分（一大一小表示疑惑）
-                draw.ellipse([22, 28, 36, 42], fill='#FFFEFA', outline='black')  # 左眼大一些
-                draw.ellipse([44, 30, 54, 40], fill='#FFFEFA', outline='black')  # 右眼小一些
-                # 好奇的嘴巴（小圆形表示"哦"）
-                draw.ellipse([37, 47, 43, 53], fill='black')
-                # 感叹号表示惊讶
-                draw.text((60, 15), "!", fill='black')
-
-            # 添加可爱的腮红
-            if emotion in ['happy', 'excited', 'curious']:
-                draw.ellipse([15, 45, 25, 55], fill='#FF9999', outline=None)
-                draw.ellipse([55, 45, 65, 55], fill='#FF9999', outline=None)
-            
+            img = sprite_set['still'][emotion]
             self.pet_images[emotion] = ImageTk.PhotoImage(img)
 
-            # 眨眼动画相关
-            self.blink_frame = 0
-            self.is_blinking = False
-            self.blink_interval = random.randint(80, 150)  # 眨眼间隔帧数
-
-            def blink_animation():
-                if not self.is_hidden:
-                    self.blink_frame += 1
-                # 随机眨眼
-                if not self.is_blinking and self.blink_frame >= self.blink_interval:
-                    self.is_blinking = True
-                    self.blink_frame = 0
-                    self.blink_interval = random.randint(80, 150)
-                    # 眨眼持续帧数
-                    self.blink_duration = 8
-                    self.blink_count = 0
-                if self.is_blinking:
-                    self.blink_count += 1
-                    # 眨眼持续一段时间
-                    if self.blink_count >= self.blink_duration:
-                        self.is_blinking = False
-                        self.blink_count = 0
-                self.root.after(50, blink_animation)
-            blink_animation()
-
-            # 修改 create_dynamic_pet_image 以支持眨眼
-            old_create_dynamic_pet_image = self.create_dynamic_pet_image
-            def create_dynamic_pet_image_with_blink(emotion, mouse_x, mouse_y):
-                img = Image.new('RGBA', (80, 80), (255, 255, 255, 0))
-                draw = ImageDraw.Draw(img)
-                pet_center_x = 40
-                pet_center_y = 50
-
-                blink = self.is_blinking
-
-                if emotion == 'normal':
-                    draw.ellipse([10, 20, 70, 70], fill='#4CAF50', outline='#2E7D32', width=2)
-                    # 眼睛
-                    if blink:
-                        # 画闭眼（横线）
-                        draw.line([25, 35, 35, 35], fill='black', width=3)
-                        draw.line([45, 35, 55, 35], fill='black', width=3)
-                    else:
-                        draw.ellipse([25, 30, 35, 40], fill='#FFFEFA', outline='black')
-                        draw.ellipse([45, 30, 55, 40], fill='#FFFEFA', outline='black')
-                        left_eye_x, left_eye_y = self.calculate_eye_position(30, 35, mouse_x, mouse_y)
-                        right_eye_x, right_eye_y = self.calculate_eye_position(50, 35, mouse_x, mouse_y)
-                        draw.ellipse([left_eye_x-2, left_eye_y-2, left_eye_x+2, left_eye_y+2], fill='black')
-                        draw.ellipse([right_eye_x-2, right_eye_y-2, right_eye_x+2, right_eye_y+2], fill='black')
-                    draw.arc([35, 45, 45, 55], 0, 180, fill='black', width=2)
-
-                elif emotion == 'happy':
-                    draw.ellipse([10, 20, 70, 70], fill='#FFC107', outline='#FF8F00', width=2)
-                    if blink:
-                        draw.line([25, 35, 35, 35], fill='black', width=3)
-                        draw.line([45, 35, 55, 35], fill='black', width=3)
-                    else:
-                        draw.ellipse([25, 30, 35, 40], fill='#FFFEFA', outline='black')
-                        draw.ellipse([45, 30, 55, 40], fill='#FFFEFA', outline='black')
-                        left_eye_x, left_eye_y = self.calculate_eye_position(30, 35, mouse_x, mouse_y)
-                        right_eye_x, right_eye_y = self.calculate_eye_position(50, 35, mouse_x, mouse_y)
-                        draw.ellipse([left_eye_x-2, left_eye_y-2, left_eye_x+2, left_eye_y+2], fill='black')
-                        draw.ellipse([right_eye_x-2, right_eye_y-2, right_eye_x+2, right_eye_y+2], fill='black')
-                    draw.arc([30, 40, 50, 60], 0, 180, fill='black', width=3)
-                    draw.ellipse([15, 45, 25, 55], fill='#FF9999', outline=None)
-                    draw.ellipse([55, 45, 65, 55], fill='#FF9999', outline=None)
-
-                elif emotion == 'sleepy':
-                    draw.ellipse([10, 20, 70, 70], fill='#2196F3', outline='#0D47A1', width=2)
-                    # 困倦时始终闭眼
-                    draw.ellipse([25, 33, 35, 37], fill='#FFFEFA', outline='black')
-                    draw.ellipse([45, 33, 55, 37], fill='#FFFEFA', outline='black')
-                    draw.line([25, 35, 35, 35], fill='black', width=2)
-                    draw.line([45, 35, 55, 35], fill='black', width=2)
-                    draw.ellipse([38, 48, 42, 52], fill='black')
-                    z_count = (self.animation_frame // 5) % 4
-                    z_text = "z" * z_count
-                    draw.text((55, 15), z_text, fill='black')
-
-                elif emotion == 'excited':
-                    draw.ellipse([10, 20, 70, 70], fill='#F44336', outline='#B71C1C', width=2)
-                    if blink:
-                        draw.line([20, 32, 35, 32], fill='black', width=3)
-                        draw.line([45, 32, 60, 32], fill='black', width=3)
-                    else:
-                        draw.ellipse([20, 25, 35, 40], fill='#FFFEFA', outline='black')
-                        draw.ellipse([45, 25, 60, 40], fill='#FFFEFA', outline='black')
-                        left_eye_x, left_eye_y = self.calculate_eye_position(27.5, 32.5, mouse_x, mouse_y)
-                        right_eye_x, right_eye_y = self.calculate_eye_position(52.5, 32.5, mouse_x, mouse_y)
-                        draw.ellipse([left_eye_x-2.5, left_eye_y-2.5, left_eye_x+2.5, left_eye_y+2.5], fill='black')
-                        draw.ellipse([right_eye_x-2.5, right_eye_y-2.5, right_eye_x+2.5, right_eye_y+2.5], fill='black')
-                    draw.ellipse([35, 45, 45, 55], fill='black')
-                    draw.ellipse([15, 45, 25, 55], fill='#FF9999', outline=None)
-                    draw.ellipse([55, 45, 65, 55], fill='#FF9999', outline=None)
-
-                elif emotion == 'thinking':
-                    draw.ellipse([10, 20, 70, 70], fill='#9C27B0', outline='#4A148C', width=2)
-                    if blink:
-                        draw.line([25, 32, 35, 32], fill='black', width=3)
-                        draw.line([45, 32, 55, 32], fill='black', width=3)
-                    else:
-                        draw.ellipse([25, 30, 35, 40], fill='#FFFEFA', outline='black')
-                        draw.ellipse([45, 30, 55, 40], fill='#FFFEFA', outline='black')
-                        left_eye_x, left_eye_y = self.calculate_eye_position(30, 32, mouse_x, mouse_y-5)
-                        right_eye_x, right_eye_y = self.calculate_eye_position(50, 32, mouse_x, mouse_y-5)
-                        draw.ellipse([left_eye_x-2, left_eye_y-2, left_eye_x+2, left_eye_y+2], fill='black')
-                        draw.ellipse([right_eye_x-2, right_eye_y-2, right_eye_x+2, right_eye_y+2], fill='black')
-                    draw.arc([35, 50, 45, 55], 0, 180, fill='black', width=2)
-                    draw.ellipse([55, 10, 65, 20], fill='white', outline='black')
-                    draw.text((57, 12), "?", fill='black')
-
-                elif emotion == 'curious':
-                    draw.ellipse([10, 20, 70, 70], fill='#FF9800', outline='#E65100', width=2)
-                    if blink:
-                        draw.line([22, 35, 36, 35], fill='black', width=3)
-                        draw.line([44, 35, 54, 35], fill='black', width=3)
-                    else:
-                        draw.ellipse([22, 28, 36, 42], fill='#FFFEFA', outline='black')
-                        draw.ellipse([44, 30, 54, 40], fill='#FFFEFA', outline='black')
-                        left_eye_x, left_eye_y = self.calculate_eye_position(29, 35, mouse_x, mouse_y)
-                        right_eye_x, right_eye_y = self.calculate_eye_position(49, 35, mouse_x, mouse_y)
-                        draw.ellipse([left_eye_x-3, left_eye_y-3, left_eye_x+3, left_eye_y+3], fill='black')
-                        draw.ellipse([right_eye_x-2, right_eye_y-2, right_eye_x+2, right_eye_y+2], fill='black')
-                    draw.ellipse([37, 47, 43, 53], fill='black')
-                    draw.text((60, 15), "!", fill='black')
-                    draw.ellipse([15, 45, 25, 55], fill='#FF9999', outline=None)
-                    draw.ellipse([55, 45, 65, 55], fill='#FF9999', outline=None)
-
-                return ImageTk.PhotoImage(img)
-            self.create_dynamic_pet_image = create_dynamic_pet_image_with_blink
-
-    def create_dynamic_pet_image(self, emotion, mouse_x, mouse_y):
-        """根据鼠标位置动态创建宠物图像"""
-        # 创建图像
-        img = Image.new('RGBA', (80, 80), (255, 255, 255, 0))
-        draw = ImageDraw.Draw(img)
-        
-        if emotion == 'normal':
-            # 普通表情 - 绿色圆形身体
-            draw.ellipse([10, 20, 70, 70], fill='#4CAF50', outline='#2E7D32', width=2)
-            # 眼睛白色部分
-            draw.ellipse([25, 30, 35, 40], fill='#FFFEFA', outline='black')
-            draw.ellipse([45, 30, 55, 40], fill='#FFFEFA', outline='black')
-            
-            # 计算眼球位置
-            left_eye_x, left_eye_y = self.calculate_eye_position(30, 35, mouse_x, mouse_y)
-            right_eye_x, right_eye_y = self.calculate_eye_position(50, 35, mouse_x, mouse_y)
-            
-            # 画眼球
-            draw.ellipse([left_eye_x-2, left_eye_y-2, left_eye_x+2, left_eye_y+2], fill='black')
-            draw.ellipse([right_eye_x-2, right_eye_y-2, right_eye_x+2, right_eye_y+2], fill='black')
-            # 嘴巴
-            draw.arc([35, 45, 45, 55], 0, 180, fill='black', width=2)
-
-        elif emotion == 'happy':
-            # 开心表情 - 黄色身体
-            draw.ellipse([10, 20, 70, 70], fill='#FFC107', outline='#FF8F00', width=2)
-            # 眼睛白色部分
-            draw.ellipse([25, 30, 35, 40], fill='#FFFEFA', outline='black')
-            draw.ellipse([45, 30, 55, 40], fill='#FFFEFA', outline='black')
-            
-            # 计算眼球位置
-            left_eye_x, left_eye_y = self.calculate_eye_position(30, 35, mouse_x, mouse_y)
-            right_eye_x, right_eye_y = self.calculate_eye_position(50, 35, mouse_x, mouse_y)
-            
-            # 画眼球
-            draw.ellipse([left_eye_x-2, left_eye_y-2, left_eye_x+2, left_eye_y+2], fill='black')
-            draw.ellipse([right_eye_x-2, right_eye_y-2, right_eye_x+2, right_eye_y+2], fill='black')
-            # 开心的嘴巴
-            draw.arc([30, 40, 50, 60], 0, 180, fill='black', width=3)
-            # 腮红
-            draw.ellipse([15, 45, 25, 55], fill='#FF9999', outline=None)
-            draw.ellipse([55, 45, 65, 55], fill='#FF9999', outline=None)
-
-        elif emotion == 'sleepy':
-            # 困倦表情 - 蓝色身体
-            draw.ellipse([10, 20, 70, 70], fill='#2196F3', outline='#0D47A1', width=2)
-            # 困倦的眼睛（闭着的，不跟随鼠标）
-            draw.ellipse([25, 33, 35, 37], fill='#FFFEFA', outline='black')
-            draw.ellipse([45, 33, 55, 37], fill='#FFFEFA', outline='black')
-            draw.line([25, 35, 35, 35], fill='black', width=2)
-            draw.line([45, 35, 55, 35], fill='black', width=2)
-            # 小嘴巴
-            draw.ellipse([38, 48, 42, 52], fill='black')
-            # "zzz"动画 - 依次显示不同数量的z，形成动画效果
-            z_count = (self.animation_frame // 5) % 4   # 0~3个z循环
-            z_text = "z" * z_count
-            draw.text((55, 15), z_text, fill='black')
-
-        elif emotion == 'excited':
-            # 兴奋表情 - 红色身体
-            draw.ellipse([10, 20, 70, 70], fill='#F44336', outline='#B71C1C', width=2)
-            # 大眼睛白色部分
-            draw.ellipse([20, 25, 35, 40], fill='#FFFEFA', outline='black')
-            draw.ellipse([45, 25, 60, 40], fill='#FFFEFA', outline='black')
-            
-            # 计算眼球位置（不同的眼睛中心）
-            left_eye_x, left_eye_y = self.calculate_eye_position(27.5, 32.5, mouse_x, mouse_y)
-            right_eye_x, right_eye_y = self.calculate_eye_position(52.5, 32.5, mouse_x, mouse_y)
+    def get_pupil_cell(self, emotion, mouse_x, mouse_y, t):
+        """推进眼球弹簧到动画时间 t，返回量化后的眼球格点"""
+        # 先按旧目标推进到当前时刻，新目标从这一刻开始生效
+        self.pupil_spring.advance(t)
+        # 鼠标和表情不变时目标不变，弹簧收敛后也不再计算
+        eye_input = (emotion, mouse_x, mouse_y)
+        if eye_input != self._last_eye_input:
+            self._last_eye_input = eye_input
+            if self.retarget_pupil(self.compute_pupil_target(emotion, mouse_x, mouse_y)):
+                # 弹簧运动期间提高帧率，收敛后自动降回去
+                self.frame_governor.update()
+        # 设置目标之后再取位置：关闭弹簧（频率为0）时眼球当帧就跳到新目标，和预测一致
+        return snap_pupil(*self.pupil_spring.position, self.eye_max_radius)
+
+    def retarget_pupil(self, target):
+        """把眼球弹簧指向新目标，画面不会变化的微小移动直接忽略，返回是否设置了新目标"""
+        spring = self.pupil_spring
+        if spring.converged:
+            # 静止的眼球量化后仍落在同一格点上，不必让弹簧起步
+            cell = snap_pupil(*spring.position, self.eye_max_radius)
+            if snap_pupil(*target, self.eye_max_radius) == cell:
+                return False
+        elif math.dist(target, spring.target) < spring.rest_distance:
+            # 运动中的目标只挪了不到半个像素
+            return False
+        spring.set_target(target)
+        return True
+
+    def compute_pupil_target(self, emotion, mouse_x, mouse_y):
+        """按鼠标位置计算眼球的目标偏移（连续值，不经过缓存）"""
+        eyes = self.face_spec.eyes.get(emotion)
+        if not eyes:
+            return (0, 0)
+        anchor_x, anchor_y, bias_y = eyes.anchor
+        eye_x, eye_y = self.calculate_eye_position(anchor_x, anchor_y, mouse_x, mouse_y + bias_y)
+        return eye_x - anchor_x, eye_y - anchor_y
+
+    def predict_sprite_key(self):
+        """预测下一帧的精灵状态：鼠标按上一帧的移动外推，眨眼和zzz按下一帧的动画时间计算"""
+        t = self.animation_clock.now() + self.frame_clock.frame_interval / 1000
+        mouse_x = 2 * self.mouse_x - self._prev_mouse[0]
+        mouse_y = 2 * self.mouse_y - self._prev_mouse[1]
+        self._prev_mouse = (self.mouse_x, self.mouse_y)
+        target = self.compute_pupil_target(self.current_emotion, mouse_x, mouse_y)
+        pupil = snap_pupil(*self.pupil_spring.peek(t, target), self.eye_max_radius)
+        return self.face_spec.normalize_key(self.current_emotion, self.blink_schedule.peek(t), pupil, zzz_count(t))
+
+    def update_sprite_state(self):
+        """把当前表情、眨眼、眼球和zzz写入渲染状态"""
+        # 眨眼和zzz都是动画时间的函数，按任意帧率采样都不会变快变慢
+        t = self.animation_clock.now()
+        self.is_blinking = self.blink_schedule.is_blinking(t)
+        z_count = zzz_count(t)
+        pupil = self.get_pupil_cell(self.current_emotion, self.mouse_x, self.mouse_y, t)
+        # 归一化后再比较，与当前表情无关的维度变化不会触发重绘
+        emotion, blink, pupil, zzz = self.face_spec.normalize_key(
+            self.current_emotion, self.is_blinking, pupil, z_count
+        )
+        self.render_state.update(emotion=emotion, blink=blink, pupil=pupil, zzz=zzz, fade=self.get_fade(t))
+
+    def get_fade(self, t):
+        """当前显示的过渡帧 (原表情, 新表情, 过渡帧下标)，不在过渡中时为None"""
+        if self.transition is None:
+            return None
+        src, dst, start = self.transition
+        step = int((t - start) / self.crossfade_time * self.crossfade_steps)
+        if step >= self.crossfade_steps:
+            self.transition = None
+            return None
+        return (src, dst, max(0, step))
+
+    def create_pet_renderer(self):
+        """根据渲染模式创建宠物渲染器"""
+        center = (self.pet_size//2, self.total_height - self.pet_size//2)
+        sprite_set = self.get_sprite_set(self.sprite_scale)
+        crossfade = sprite_set['crossfade']
+        self.render_worker = None
+        if self.render_mode == 'vector':
+            return VectorPetRenderer(self.canvas, self.pet_sprite, sprite_set['spec'], sprite_set['base_photos'], center,
+                                     crossfade)
+        if self.render_mode == 'composite':
+            compositor = sprite_set['compositor']
+            if self.use_render_worker:
+                # 工作线程用自己的合成器和缓冲区，表情底图共用
+                worker_compositor = FrameCompositor(compositor.spec, compositor.supersample)
+                worker_compositor.base_layers = compositor.base_layers
+                self.render_worker = RenderWorker(worker_compositor)
+            return CompositeRenderer(self.canvas, self.pet_sprite, compositor, center, crossfade, self.render_worker)
+        transfer = self.main_config.get('render', {}).get('transfer', 'paste')
+        return AtlasRenderer(self.canvas, self.pet_sprite, sprite_set['atlas'], center, transfer, crossfade)
+
+    def canvas_to_sprite(self, x, y):
+        """把画布坐标转换为精灵设计尺寸下的坐标"""
+        spec = self.face_spec.scaled(self.sprite_scale)
+        left = self.pet_size // 2 - spec.size / 2
+        top = self.total_height - self.pet_size // 2 - spec.size / 2
+        return (x - left) / spec.scale, (y - top) / spec.scale
+
+    def hit_test(self, x, y):
+        """画布坐标 (x, y) 是否点在宠物身上（查当前表情的透明度位图）"""
+        mask = self.get_sprite_set(self.sprite_scale)['masks'][self.current_emotion]
+        offset_x, offset_y = self.render_state.offset
+        # 精灵图像以画布上的宠物中心为中心，叠加动作位移
+        left = self.pet_size // 2 + offset_x - mask.width // 2
+        top = self.total_height - self.pet_size // 2 + offset_y - mask.height // 2
+        return mask.hit(int(x - left), int(y - top))
+
+    def update_display_scale(self):
+        """显示器DPI变化时切换到对应缩放的精灵（已缓存的缩放不会重新渲染）"""
+        dpi_scale = self.get_dpi_scale()
+        if dpi_scale == self.dpi_scale:
+            return
+        self.dpi_scale = dpi_scale
+        self.screen_size = (self.root.winfo_screenwidth(), self.root.winfo_screenheight())
+        self.pet_size = round(self.base_pet_size * dpi_scale)
+        self.total_height = round(self.base_total_height * dpi_scale)
+        self.sprite_scale = self.get_sprite_scale()
+        self.root.geometry(f"{self.pet_size}x{self.total_height}")
+        self.canvas.config(width=self.pet_size, height=self.total_height)
+
+        # 重建渲染器并强制完整重绘一次
+        self.pet_renderer.destroy()
+        self.pet_renderer = self.create_pet_renderer()
+        self.canvas.coords(self.pet_sprite, self.pet_size//2, self.total_height - self.pet_size//2)
+        self.render_state = RenderState()
+        # 粒子按新的缩放重建，画布元素仍在宠物之上
+        self.particles.destroy()
+        self.particles = self.create_particle_layer()
+
+    def create_particle_layer(self):
+        """创建粒子层（画布元素预先建好，之后只复用）"""
+        return ParticleLayer(self.canvas, self.particle_capacity, self.particle_max_calls, self.sprite_scale)
+
+    def emit_particles(self, kind, dx, dy, count):
+        """在宠物中心偏移 (dx, dy)（设计尺寸单位）处放出粒子"""
+        x = self.pet_size // 2 + dx * self.sprite_scale
+        y = self.total_height - self.pet_size // 2 + dy * self.sprite_scale
+        self.particles.emit(kind, x, y, count)
+        self.frame_governor.update()
+
+    def start_particles(self):
+        """启动粒子更新：困倦时飘出z，所有粒子每帧推进一次"""
+        def update_particles(dt):
+            if self.is_hidden:
+                return
+            if self.current_emotion == 'sleepy' and self.zzz_interval > 0:
+                t = self.animation_clock.now()
+                if t >= self.next_zzz_time:
+                    self.next_zzz_time = t + self.zzz_interval
+                    self.emit_particles('zzz', 16, -30, 1)
+            self.particles.update(dt)
+
+        # 跟随自适应帧率更新，放在画面推送之后
+        self.frame_clock.register('particles', update_particles)
+
+    def start_cursor_polling(self):
+        """轮询全局光标位置，让眼睛跟随屏幕上任意位置的光标（隐藏时随帧时钟一起停止）"""
+        if self.cursor_poller is None:
+            return
 
-            
-            # 画眼球
-            draw.ellipse([left_eye_x-2.5, left_eye_y-2.5, left_eye_x+2.5, left_eye_y+2.5], fill='black')
-            draw.ellipse([right_eye_x-2.5, right_eye_y-2.5, right_eye_x+2.5, right_eye_y+2.5], fill='black')
-            # 兴奋的嘴巴
-            draw.ellipse([35, 45, 45, 55], fill='black')
-            # 腮红
-            draw.ellipse([15, 45, 25, 55], fill='#FF9999', outline=None)
-            draw.ellipse([55, 45, 65, 55], fill='#FF9999', outline=None)
-
-        elif emotion == 'thinking':
-            # 思考表情 - 紫色身体
-            draw.ellipse([10, 20, 70, 70], fill='#9C27B0', outline='#4A148C', width=2)
-            # 眼睛白色部分
-            draw.ellipse([25, 30, 35, 40], fill='#FFFEFA', outline='black')
-            draw.ellipse([45, 30, 55, 40], fill='#FFFEFA', outline='black')
-            
-            # 思考时眼睛倾向于向上看，但仍会跟随鼠标
-            # 添加向上偏移
-            left_eye_x, left_eye_y = self.calculate_eye_position(30, 32, mouse_x, mouse_y-5)
-            right_eye_x, right_eye_y = self.calculate_eye_position(50, 32, mouse_x, mouse_y-5)
-            # else:
-            #     left_eye_x, left_eye_y = 30, 32
-            #     right_eye_x, right_eye_y = 50, 32
-            
-            # 画眼球
-            draw.ellipse([left_eye_x-2, left_eye_y-2, left_eye_x+2, left_eye_y+2], fill='black')
-            draw.ellipse([right_eye_x-2, right_eye_y-2, right_eye_x+2, right_eye_y+2], fill='black')
-            # 思考的嘴巴
-            draw.arc([35, 50, 45, 55], 0, 180, fill='black', width=2)
-            # 思考泡泡
-            draw.ellipse([55, 10, 65, 20], fill='white', outline='black')
-            draw.text((57, 12), "?", fill='black')
-                
-        elif emotion == 'curious':
-            # 好奇表情 - 橙色身体
-            draw.ellipse([10, 20, 70, 70], fill='#FF9800', outline='#E65100', width=2)
-            # 好奇的大眼睛白色部分（一大一小表示疑惑）
-            draw.ellipse([22, 28, 36, 42], fill='#FFFEFA', outline='black')  # 左眼大一些
-            draw.ellipse([44, 30, 54, 40], fill='#FFFEFA', outline='black')  # 右眼小一些
-            
-            # 计算眼球位置（不同大小的眼睛）
-            left_eye_x, left_eye_y = self.calculate_eye_position(29, 35, mouse_x, mouse_y)
-            right_eye_x, right_eye_y = self.calculate_eye_position(49, 35, mouse_x, mouse_y)
-            # else:
-            #     left_eye_x, left_eye_y = 29, 35
-            #     right_eye_x, right_eye_y = 49, 35
-            
-            # 画眼球（左眼大一些）
-            draw.ellipse([left_eye_x-3, left_eye_y-3, left_eye_x+3, left_eye_y+3], fill='black')
-            draw.ellipse([right_eye_x-2, right_eye_y-2, right_eye_x+2, right_eye_y+2], fill='black')
-            # 好奇的嘴巴（小圆形表示"哦"）
-            draw.ellipse([37, 47, 43, 53], fill='black')
-            # 感叹号表示惊讶
-            draw.text((60, 15), "!", fill='black')
-            # 腮红
-            draw.ellipse([15, 45, 25, 55], fill='#FF9999', outline=None)
-            draw.ellipse([55, 45, 65, 55], fill='#FF9999', outline=None)
-        
-        return ImageTk.PhotoImage(img)
+        def poll_cursor(dt):
+            position = self.cursor_poller.poll()
+            # 下次轮询的间隔：移动时最短，静止时逐次加倍
+            subsystem.interval = self.cursor_poller.interval
+            if position is not None:
+                x = position[0] - self.root.winfo_rootx()
+                y = position[1] - self.root.winfo_rooty()
+                # 眼球格点没有变化时渲染状态不会变脏，不会重绘
+                self.mouse_x, self.mouse_y = self.canvas_to_sprite(x, y)
+
+        subsystem = self.frame_clock.register('cursor', poll_cursor, self.cursor_poller.interval)
 
     def start_eye_tracking(self):
         """启动眼球追踪"""
-        # 记录上次鼠标移动时间
-        self.last_mouse_move_time = time.time()
-
-        def track_eyes():
+        def track_eyes(dt):
             if not self.is_hidden:
-                # 更新宠物图像
-                new_image = self.create_dynamic_pet_image(self.current_emotion, self.mouse_x, self.mouse_y)
-                self.canvas.itemconfig(self.pet_sprite, image=new_image)
-                # 保持引用避免被垃圾回收
-                self.current_pet_image = new_image
-
-                # 检查是否需要重置眼球位置
-                if time.time() - self.last_mouse_move_time > 10:
+                self.update_sprite_state()
+                # 只有状态变化时才更新宠物图像
+                if self.render_state.is_dirty(*RenderState.SPRITE_FIELDS):
+                    self.render_stats['sprite_updates'] += self.pet_renderer.draw(self.render_state)
+                    self.render_state.clear(*RenderState.SPRITE_FIELDS)
+                if self.render_worker is not None:
+                    # 趁两帧之间让后台线程先合成下一帧
+                    self.render_worker.request(self.predict_sprite_key())
+
+                # 只跟踪画布内的鼠标时，鼠标离开一段时间后重置眼球位置
+                if self.cursor_poller is None and time.time() - self.last_mouse_move_time > 10:
                     # 回到默认位置（宠物中心）
-                    self.mouse_x = self.pet_size // 2
-                    self.mouse_y = self.total_height - self.pet_size // 2
+                    self.mouse_x, self.mouse_y = self.canvas_to_sprite(
+                        self.pet_size // 2, self.total_height - self.pet_size // 2
+                    )
 
-            # 每100ms更新一次
-            self.root.after(100, track_eyes)
-        track_eyes()
-
-        # 鼠标移动时更新last_mouse_move_time
-        def on_mouse_motion_wrapper(event):
-            self.last_mouse_move_time = time.time()
-            pet_offset_x = (self.pet_size - 80) // 2
-            pet_offset_y = self.total_height - self.pet_size
-            self.mouse_x = event.x - pet_offset_x
-            self.mouse_y = event.y - pet_offset_y
-        # 重新绑定鼠标移动事件
-        self.canvas.bind("<Motion>", on_mouse_motion_wrapper)
+        # 跟随自适应帧率更新
+        self.frame_clock.register('eyes', track_eyes)
 
     def create_tray_icon(self):
         """创建系统托盘图标"""
         # 创建托盘图标图像（简化的宠物图标）
-        tray_image = Image.new('RGB', (64, 64), color='white')
-        draw = ImageDraw.Draw(tray_image)
-        
-        # 绘制可爱的宠物图标
-        # 身体
-        draw.ellipse([5, 15, 55, 55], fill='#4CAF50', outline='#2E7D32', width=2)
-        # 眼睛
-        draw.ellipse([15, 25, 25, 35], fill='white', outline='black')
-        draw.ellipse([35, 25, 45, 35], fill='white', outline='black')
-        draw.ellipse([18, 28, 22, 32], fill='black')
-        draw.ellipse([38, 28, 42, 32], fill='black')
-        # 嘴巴
-        draw.arc([25, 35, 35, 45], 0, 180, fill='black', width=2)
-        # 可爱的腮红
-        draw.ellipse([8, 35, 15, 42], fill='#FF9999')
-        draw.ellipse([45, 35, 52, 42], fill='#FF9999')
+        tray_image = render_tray_icon(self.face_spec)
         
         # 创建托盘菜单
         menu = pystray.Menu(
@@ -660,6 +669,8 @@ class DesktopPet:
             self.total_height - self.pet_size//2, 
             image=self.pet_images[self.current_emotion]
         )
+        self.pet_renderer = self.create_pet_renderer()
+        self.particles = self.create_particle_layer()
         
         # 创建右键菜单
         self.context_menu = tk.Menu(self.root, tearoff=0)
@@ -688,56 +699,105 @@ class DesktopPet:
         """绑定事件"""
         # 鼠标事件
         self.canvas.bind("<Button-1>", self.on_click)
-        self.canvas.bind("<B1-Motion>", self.on_drag)
+        self.canvas.bind("<B1-Motion>", self.pointer.on_event)  # 拖拽由指针采样驱动
         self.canvas.bind("<ButtonRelease-1>", self.on_release)
         self.canvas.bind("<Button-3>", self.show_context_menu)  # 右键菜单
         self.canvas.bind("<Double-Button-1>", self.on_double_click)  # 双击切换表情
         
-        # 鼠标悬停事件
-        self.canvas.bind("<Enter>", self.on_mouse_enter)
-        self.canvas.bind("<Leave>", self.on_mouse_leave)
-        self.canvas.bind("<Motion>", self.on_mouse_motion)  # 鼠标移动事件
-
-    def on_mouse_motion(self, event):
-        """鼠标移动事件"""
-        # 转换为相对于宠物图像的坐标
-        # 宠物图像是80x80，显示在100x150窗口的下方
-        pet_offset_x = (self.pet_size - 80) // 2  # 居中偏移
-        pet_offset_y = self.total_height - self.pet_size  # 下方偏移
-        
-        self.mouse_x = event.x - pet_offset_x
-        self.mouse_y = event.y - pet_offset_y
+        # 鼠标悬停事件：是否在宠物身上按透明度位图判断
+        self.canvas.bind("<Enter>", self.on_pointer_event)
+        self.canvas.bind("<Leave>", self.on_canvas_leave)
+        self.canvas.bind("<Motion>", self.on_pointer_event)  # 鼠标移动事件只记下坐标
+
+    def on_pointer_event(self, event):
+        """鼠标进入画布或移动：记下坐标，还没悬停时立即判断是否移到了宠物身上（帧率很低时也能马上响应）"""
+        self.pointer.on_event(event)
+        # 悬停时是active档，移出宠物交给下一帧的采样判断
+        if not self.mouse_over:
+            self.update_hover(event)
+
+    def update_hover(self, event):
+        """只有指针落在宠物不透明的像素上才算悬停（event 为Tk事件或指针采样，查一位透明度位图）"""
+        # 画布外的点（离开画布的事件）一定不在宠物身上
+        inside = 0 <= event.x < self.pet_size and 0 <= event.y < self.total_height
+        over = inside and self.hit_test(event.x, event.y)
+        if over and not self.mouse_over:
+            self.on_mouse_enter(event)
+        elif not over and self.mouse_over:
+            self.on_mouse_leave(event)
+
+    def start_pointer_sampling(self):
+        """每帧取一次指针样本，统一驱动眼球追踪、悬停计时和拖拽"""
+        def sample_pointer(dt):
+            # 这一批事件里第一个事件到达的时刻，用来统计拖拽延迟
+            since = self.pointer.first_event_time
+            sample = self.pointer.sample()
+            if sample is None:
+                return
+            self.last_mouse_move_time = time.time()
+            # 转换为相对于宠物图像的坐标（精灵设计尺寸下）
+            self.mouse_x, self.mouse_y = self.canvas_to_sprite(sample.x, sample.y)
+            # 同一批里后续的事件可能已经移进或移出宠物
+            self.update_hover(sample)
+            if self.is_dragging:
+                self.on_drag(sample, since)
+
+        # 最先注册：同一帧里的其他子系统都用这次采样的结果
+        self.frame_clock.register('pointer', sample_pointer)
 
     def update_interaction_time(self):
         """更新最后交互时间"""
         self.last_interaction_time = time.time()
+        # 每次交互都把空闲截止时间往后推
+        self.arm_idle_timers()
+        self.frame_governor.update()
+
+    def select_frame_level(self):
+        """根据宠物状态选择帧率档位"""
+        if self.is_hidden:
+            return 'hidden'
+        if self.is_dragging or self.mouse_over or self.transition is not None:
+            return 'active'
+        if self.current_emotion == 'sleepy':
+            # 困倦时只有缓慢飘动的z，跟着sleepy档的帧率推进，不会把帧率拉高
+            return 'sleepy'
+        if len(self.particles):
+            return 'active'
+        if not self.pupil_spring.converged:
+            # 眼球弹簧只需要awake档的帧率，光标在屏幕上移动不会把帧率拉满
+            return 'awake'
+        now = time.time()
+        if now - max(self.last_mouse_move_time, self.last_interaction_time) > self.idle_after:
+            return 'idle'
+        return 'awake'
 
     def start_behavior_monitoring(self):
-        """开始行为监控 - 根据交互情况自动切换表情"""
-        def monitor_behavior():
-            if not self.is_hidden and not self.is_dragging and not self.mouse_over:
-                current_time = time.time()
-                idle_time = current_time - self.last_interaction_time
-                
-                # 根据空闲时间决定表情（只在鼠标不在宠物上时）
-                if idle_time > self.idle_time_threshold:
-                    # 超过300秒没有交互 - 困倦
-                    if self.current_emotion != 'sleepy':
-                        self.change_emotion('sleepy')
-                        if random.random() < 0.3:  # 30%概率说话
-                            self.say_random_message('sleepy')
-                elif idle_time > self.thinking_time_threshold:
-                    # 超过60秒没有交互 - 思考
-                    if self.current_emotion not in ['sleepy', 'thinking']:
-                        self.change_emotion('thinking')
-                        if random.random() < 0.2:  # 20%概率说话
-                            self.say_random_message('thinking')
-            
-            # 每5秒检查一次
-            self.root.after(5000, monitor_behavior)
-        
-        # 5秒后开始监控
-        self.root.after(5000, monitor_behavior)
+        """开始行为监控 - 空闲达到阈值时自动切换表情（按截止时间触发，不轮询）"""
+        self.arm_idle_timers()
+
+    def arm_idle_timers(self):
+        """按最后交互时间重新排定进入思考、困倦状态的截止定时器"""
+        idle_time = time.time() - self.last_interaction_time
+        thinking_delay = max(0, round((self.thinking_time_threshold - idle_time) * 1000))
+        sleepy_delay = max(0, round((self.idle_time_threshold - idle_time) * 1000))
+        self.timers.schedule('idle_thinking', thinking_delay, lambda: self.on_idle_timeout('thinking'))
+        self.timers.schedule('idle_sleepy', sleepy_delay, lambda: self.on_idle_timeout('sleepy'))
+
+    def on_idle_timeout(self, emotion):
+        """空闲达到阈值时切换表情（鼠标在宠物上或正在拖拽时不切换，离开后会重新排定）"""
+        if self.is_hidden or self.is_dragging or self.mouse_over:
+            return
+        if emotion == 'sleepy':
+            # 超过300秒没有交互 - 困倦
+            if self.current_emotion != 'sleepy':
+                self.change_emotion('sleepy')
+                if random.random() < 0.3:  # 30%概率说话
+                    self.say_random_message('sleepy')
+        elif self.current_emotion not in ['sleepy', 'thinking']:
+            # 超过60秒没有交互 - 思考
+            self.change_emotion('thinking')
+            if random.random() < 0.2:  # 20%概率说话
+                self.say_random_message('thinking')
 
     def create_speech_bubble(self, text):
         """创建对话框"""
@@ -788,11 +848,12 @@ class DesktopPet:
         
         self.is_speaking = True
         
-        # 3秒后自动清除对话框
-        self.root.after(3000, self.clear_speech_bubble)
+        # 3秒后自动清除对话框（替换旧对话框的定时器，不会提前清掉新对话框）
+        self.timers.schedule('speech_bubble', 3000, self.clear_speech_bubble)
 
     def clear_speech_bubble(self):
         """清除对话框"""
+        self.timers.cancel('speech_bubble')
         if self.speech_bubble:
             self.canvas.delete(self.speech_bubble)
             self.speech_bubble = None
@@ -816,11 +877,12 @@ class DesktopPet:
         self.update_interaction_time()
         
         # 判断点击位置，如果点击在宠物身上才响应
-        pet_y = self.total_height - self.pet_size//2
-        if event.y > pet_y - 40:  # 点击在宠物附近
+        if self.hit_test(event.x, event.y):
             self.is_dragging = True
-            self.drag_start_x = event.x
-            self.drag_start_y = event.y
+            self.window_drag.begin(event.x_root, event.y_root, self.get_drag_bounds())
+            # 点击时身体往下一压再弹起，冒出几颗爱心
+            self.motion.play('squash', self.animation_clock.now())
+            self.emit_particles('heart', 0, -30, 4)
             
             # 点击时表现开心
             self.change_emotion('happy')
@@ -830,34 +892,49 @@ class DesktopPet:
             category = random.choice(categories)
             self.say_random_message(category)
 
-    def on_drag(self, event):
-        """拖拽事件 - 好奇表情"""
+    def on_drag(self, event, since=None):
+        """拖拽事件 - 好奇表情（每帧最多一次，event 为指针采样）"""
         if self.is_dragging:
             # 更新交互时间
             self.update_interaction_time()
             
+            # 拖拽时身体左右抖动
+            self.motion.hold('shake', self.animation_clock.now())
+
             # 拖拽时表现好奇
             if self.current_emotion != 'curious':
                 self.change_emotion('curious')
                 if random.random() < 0.5:  # 50%概率说话
                     self.say_random_message('curious')
             
-            # 计算新位置
-            x = self.root.winfo_x() + (event.x - self.drag_start_x)
-            y = self.root.winfo_y() + (event.y - self.drag_start_y)
-            
-            # 限制在屏幕范围内
-            screen_width = self.root.winfo_screenwidth()
-            screen_height = self.root.winfo_screenheight()
-            
-            x = max(0, min(x, screen_width - self.pet_size))
-            y = max(0, min(y, screen_height - self.total_height))
-            
-            self.root.geometry(f"+{x}+{y}")
+            # 只记下最新的目标位置，由帧时钟每帧最多移动一次窗口
+            self.window_drag.motion(event.x_root, event.y_root, since)
+
+    def get_drag_bounds(self):
+        """拖拽时窗口左上角允许的最大坐标（限制在屏幕范围内）"""
+        return self.screen_size[0] - self.pet_size, self.screen_size[1] - self.total_height
+
+    def start_drag_tracking(self):
+        """拖拽时每帧把最新的目标位置应用到窗口一次"""
+        def apply_drag(dt):
+            if self.window_drag.active:
+                self.window_drag.flush()
+
+        # 拖拽时帧率为active档
+        self.frame_clock.register('drag', apply_drag)
 
     def on_release(self, event):
         """鼠标释放事件"""
         self.is_dragging = False
+        if self.window_drag.active:
+            # 松开前还没采样的最后一段移动也要生效
+            sample = self.pointer.sample()
+            if sample is not None:
+                self.window_drag.motion(sample.x_root, sample.y_root)
+            self.window_drag.end()
+        self.motion.stop('shake')
+        # 可能被拖到了另一台显示器上
+        self.update_display_scale()
         # 更新交互时间
         self.update_interaction_time()
 
@@ -865,16 +942,28 @@ class DesktopPet:
         """双击事件 - 兴奋表情并说话"""
         # 更新交互时间
         self.update_interaction_time()
+        if not self.hit_test(event.x, event.y):
+            return
         
-        # 双击时表现兴奋
+        # 双击时表现兴奋，周围闪出星星
         self.change_emotion('excited')
+        self.emit_particles('sparkle', 0, -10, 8)
         self.say_random_message('excited')
 
+    def on_canvas_leave(self, event):
+        """鼠标离开画布"""
+        # 离开时的画布外坐标作为最新样本，替换掉还没采样的画布内坐标，下一帧不会再判成悬停
+        self.pointer.on_event(event)
+        if self.mouse_over:
+            self.on_mouse_leave(event)
+
     def on_mouse_enter(self, event):
         """鼠标进入事件"""
         # 更新交互时间和鼠标状态
         self.update_interaction_time()
         self.mouse_over = True
+        self.timers.cancel('restore_emotion')
+        self.frame_governor.update()
         
         if not self.is_dragging and not self.is_speaking:
             if random.random() < 0.3:  # 30%概率说话
@@ -887,10 +976,18 @@ class DesktopPet:
         """鼠标离开事件"""
         # 更新鼠标状态
         self.mouse_over = False
+        self.frame_governor.update()
         
         if not self.is_dragging:
             # 鼠标离开后恢复normal状态
-            self.root.after(1000, lambda: self.change_emotion('normal') if not self.mouse_over else None)
+            self.timers.schedule('restore_emotion', 1000, self.restore_normal_emotion)
+
+    def restore_normal_emotion(self):
+        """鼠标离开一段时间后恢复normal表情"""
+        if not self.mouse_over:
+            self.change_emotion('normal')
+            # 悬停期间到期的空闲截止时间在这里补上
+            self.arm_idle_timers()
 
     def show_context_menu(self, event):
         """显示右键菜单"""
@@ -905,32 +1002,29 @@ class DesktopPet:
     def change_emotion(self, emotion):
         """改变宠物表情"""
         if emotion in self.emotions and not self.is_hidden:
+            if emotion != self.current_emotion and self.crossfade_time > 0 and self.crossfade_steps > 0:
+                # 从当前表情淡入新表情（过渡中再切换时从上一个目标表情开始）
+                self.transition = (self.current_emotion, emotion, self.animation_clock.now())
             self.current_emotion = emotion
-        # 如果emotion是tired，身体不再抖动
-        if emotion == 'tired':
-            self.is_bobbing = False
-        else:
-            self.is_bobbing = True
+            # 切换表情持续播放的动作轨道（例如困倦时由浮动改为摇晃）
+            self.motion.set_emotion(emotion)
+            self.frame_governor.update()
 
     def start_animation(self):
         """开始动画循环"""
-        def animate():
+        def animate(dt):
             if not self.is_hidden:
-                # 简单的浮动动画
-                self.animation_frame += 1
-                offset = int(2 * abs(self.animation_frame % 20 - 10) / 10)
-                
-                # 更新宠物位置（轻微上下浮动）
-                self.canvas.coords(
-                    self.pet_sprite, 
-                    self.pet_size//2, 
-                    self.total_height - self.pet_size//2 + offset
-                )
-            
-            # 继续动画
-            self.root.after(100, animate)
-        
-        animate()
+                # 所有动作轨道叠加成一个位移（设计尺寸单位），按精灵缩放后取整到像素
+                dx, dy = self.motion.sample(self.animation_clock.now())
+                offset = (round(dx * self.sprite_scale), round(dy * self.sprite_scale))
+                self.render_state.update(offset=offset)
+
+                # 位移变化时才更新宠物位置，一帧只有一次画布调用
+                if self.render_state.is_dirty('offset'):
+                    self.render_stats['coords_updates'] += self.pet_renderer.move(offset)
+                    self.render_state.clear('offset')
+
+        self.frame_clock.register('animation', animate)
 
     def toggle_topmost(self):
         """切换置顶状态"""
@@ -979,10 +1073,19 @@ class DesktopPet:
         self.mouse_over = False  # 重置鼠标状态
         self.clear_speech_bubble()  # 清除对话框
         self.root.withdraw()  # 隐藏窗口
+        # 挂起所有周期任务并取消待执行的定时器，在托盘里时进程不再被唤醒
+        self.frame_governor.update()
+        self.frame_clock.stop()
+        self.timers.cancel_all()
+        self.animation_clock.pause()
+        self.particles.clear()
 
     def show_pet(self):
         """显示宠物"""
         self.is_hidden = False
+        # 恢复周期任务：到期的子系统立即补跑一次，隐藏期间的时间不计入动画
+        self.animation_clock.resume()
+        self.frame_clock.start()
         self.root.deiconify()  # 显示窗口
         self.root.lift()  # 提升到前台
         self.root.focus_force()  # 获取焦点
@@ -992,6 +1095,23 @@ class DesktopPet:
         self.change_emotion('excited')
         self.create_speech_bubble("我回来啦！想我了吗？")
 
+    def get_stats(self):
+        """获取各子系统的运行统计（帧时钟、定时器、渲染、指针和最近一次拖拽的延迟）"""
+        stats = {
+            'frame_level': self.frame_governor.level,
+            'frame_clock': self.frame_clock.stats(),
+            'timers': self.timers.stats(),
+            'render': dict(self.render_stats),
+            'particles': self.particles.stats(),
+            'pointer': self.pointer.stats(),
+            'drag': self.window_drag.stats(),
+        }
+        if self.cursor_poller is not None:
+            stats['cursor'] = self.cursor_poller.stats()
+        if self.render_worker is not None:
+            stats['render_worker'] = self.render_worker.stats()
+        return stats
+
     def _start_fish_reminder(self, fish_reminder_path):
         """启动摸鱼提醒器"""
         try:
@@ -1064,7 +1184,10 @@ class DesktopPet:
         # 停止托盘图标
         if self.tray_icon:
             self.tray_icon.stop()
-        
+
+        self.frame_clock.stop()
+        self.timers.cancel_all()
+        self.pet_renderer.destroy()
         self.root.quit()
         self.root.destroy()
         sys.exit()
@@ -0,0 +1,249 @@
+import math
+import time
+from typing import Callable, Dict, List, Optional, Union
+
+# 判断到期时允许的误差（秒），Tk 的 after 精度为毫秒
+DUE_TOLERANCE = 0.001
+
+
+class Subsystem:
+    """注册到帧时钟上的一个子系统"""
+
+    def __init__(self, name: str, callback: Callable[[float], None], interval: Optional[int], next_due: float):
+        self.name = name
+        self.callback = callback  # 以距上次调用的秒数为参数
+        self.interval = interval  # 毫秒；为None时跟随时钟的帧间隔
+        self.next_due = next_due  # 下次到期的时刻（秒，time.monotonic）
+        self.last_run: Optional[float] = None
+        self.calls = 0
+        self.total_time = 0.0  # 累计耗时（秒）
+        self.max_time = 0.0  # 单次最大耗时（秒）
+
+    def stats(self) -> Dict[str, Union[float, str]]:
+        """获取子系统的调用次数和耗时（跟随帧间隔的子系统 interval_ms 为 'frame'）"""
+        return {
+            'interval_ms': self.interval if self.interval is not None else 'frame',
+            'calls': self.calls,
+            'total_ms': round(self.total_time * 1000, 3),
+            'avg_ms': round(self.total_time * 1000 / self.calls, 3) if self.calls else 0.0,
+            'max_ms': round(self.max_time * 1000, 3),
+        }
+
+
+class FrameClock:
+    """统一的帧时钟：只用一个 after 回调，按注册顺序、各自的频率驱动所有子系统
+
+    interval 为 None 的子系统跟随帧间隔运行，帧间隔由调速器按宠物状态调整，为0时暂停。
+    """
+
+    def __init__(self, root, clock: Callable[[], float] = time.monotonic, frame_interval: int = 100):
+        self.root = root
+        self.clock = clock
+        self.frame_interval = frame_interval  # 毫秒，0为暂停跟随帧间隔的子系统
+        self.subsystems: List[Subsystem] = []
+        self.after_id: Optional[str] = None
+        self.running = False
+        self.ticking = False  # 正在执行子系统，结束时会统一排期
+        self.wakeups = 0  # after 回调被唤醒的次数
+        self.governor: Optional['FrameGovernor'] = None  # 每次唤醒前先让调速器更新帧间隔
+
+    def register(self, name: str, callback: Callable[[float], None], interval: Optional[int] = None,
+                 delay: Optional[int] = None) -> Subsystem:
+        """注册子系统：每 interval 毫秒（None为跟随帧间隔）调用一次，首次在 delay 毫秒后调用（默认立即）"""
+        if any(subsystem.name == name for subsystem in self.subsystems):
+            raise ValueError(f"子系统已注册: {name}")
+        next_due = self.clock() + (delay or 0) / 1000
+        if interval is None and not self.frame_interval:
+            next_due = math.inf
+        subsystem = Subsystem(name, callback, interval, next_due)
+        self.subsystems.append(subsystem)
+        if self.running and not self.ticking:
+            # 运行中注册的子系统可能比当前排定的唤醒更早到期
+            self._schedule()
+        return subsystem
+
+    def unregister(self, name: str) -> None:
+        """注销子系统"""
+        self.subsystems = [subsystem for subsystem in self.subsystems if subsystem.name != name]
+
+    def __len__(self) -> int:
+        return len(self.subsystems)
+
+    def interval_of(self, subsystem: Subsystem) -> int:
+        """子系统当前的运行间隔（毫秒，0为暂停）"""
+        return subsystem.interval if subsystem.interval is not None else self.frame_interval
+
+    def set_frame_interval(self, frame_interval: int) -> None:
+        """调整帧间隔，跟随帧间隔的子系统按新间隔重新排期"""
+        if frame_interval == self.frame_interval:
+            return
+        self.frame_interval = frame_interval
+        now = self.clock()
+        for subsystem in self.subsystems:
+            if subsystem.interval is not None:
+                continue
+            if not frame_interval:
+                subsystem.next_due = math.inf
+                # 暂停期间不计入下次调用的时间差
+                subsystem.last_run = None
+            elif subsystem.last_run is None:
+                subsystem.next_due = now
+            else:
+                # 从上次运行算起，加速时可以马上到期，减速时顺延
+                subsystem.next_due = max(now, subsystem.last_run + frame_interval / 1000)
+        if self.running and not self.ticking:
+            self._schedule()
+
+    def start(self) -> None:
+        """启动时钟，立即执行一次到期的子系统"""
+        if not self.running:
+            self.running = True
+            self.tick()
+
+    def stop(self) -> None:
+        """停止时钟"""
+        self.running = False
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def tick(self) -> None:
+        """按注册顺序执行所有到期的子系统，然后排定下一次唤醒"""
+        self.after_id = None
+        if not self.running:
+            return
+        self.ticking = True
+        self.wakeups += 1
+        if self.governor is not None:
+            self.governor.update()
+        now = self.clock()
+        for subsystem in list(self.subsystems):
+            if now < subsystem.next_due - DUE_TOLERANCE:
+                continue
+            dt = now - subsystem.last_run if subsystem.last_run is not None else 0.0
+            subsystem.last_run = now
+            due = subsystem.next_due
+            start = time.perf_counter()
+            try:
+                subsystem.callback(dt)
+            except Exception as e:
+                # 单个子系统出错不能让整个时钟停下
+                print(f"子系统 {subsystem.name} 运行出错: {e}")
+            elapsed = time.perf_counter() - start
+            subsystem.calls += 1
+            subsystem.total_time += elapsed
+            subsystem.max_time = max(subsystem.max_time, elapsed)
+            if subsystem.next_due != due:
+                # 回调里调整了帧间隔，set_frame_interval 已经从这次运行算好了下次到期时刻
+                continue
+            # 按节拍推进；落后超过一个周期时不补跑，从当前时刻重新计时
+            interval = self.interval_of(subsystem) / 1000
+            if not interval:
+                subsystem.next_due = math.inf
+                continue
+            subsystem.next_due += interval
+            if subsystem.next_due < now:
+                subsystem.next_due = now + interval
+        self.ticking = False
+        self._schedule()
+
+    def _schedule(self) -> None:
+        """在最早到期的子系统到期时唤醒"""
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        next_due = min((subsystem.next_due for subsystem in self.subsystems), default=math.inf)
+        if next_due == math.inf:
+            return
+        delay = next_due - self.clock()
+        self.after_id = self.root.after(max(0, math.ceil(delay * 1000)), self.tick)
+
+    def stats(self) -> Dict[str, Dict[str, Union[float, str]]]:
+        """获取每个子系统的调用次数和耗时（按执行顺序）"""
+        return {subsystem.name: subsystem.stats() for subsystem in self.subsystems}
+
+    def frame_rate(self) -> float:
+        """当前帧率（每秒帧数，0为暂停）"""
+        return 1000 / self.frame_interval if self.frame_interval else 0.0
+
+
+class FrameGovernor:
+    """自适应帧率调速器：根据宠物状态选择帧率档位，设置到帧时钟上"""
+
+    def __init__(self, clock: FrameClock, levels: Dict[str, int], select_level: Callable[[], str]):
+        self.clock = clock
+        self.levels = levels  # 档位 -> 帧间隔（毫秒，0为暂停）
+        self.select_level = select_level
+        self.level: Optional[str] = None
+        self.switches = 0  # 档位切换次数
+        clock.governor = self
+
+    def update(self) -> str:
+        """重新选择档位（档位不变时不做任何事）"""
+        level = self.select_level()
+        if level != self.level:
+            self.level = level
+            self.switches += 1
+            self.clock.set_frame_interval(self.levels[level])
+        return level
+
+
+class TimerRegistry:
+    """按名字管理的一次性定时器：同名定时器重新排定时替换旧的，取消为O(1)"""
+
+    def __init__(self, root):
+        self.root = root
+        self._pending: Dict[str, str] = {}  # 名字 -> after id
+        self.scheduled = 0
+        self.replaced = 0  # 被同名新定时器替换掉的次数
+        self.cancelled = 0
+        self.fired = 0
+        self.peak = 0  # 同时存活的定时器数量峰值
+
+    def schedule(self, key: str, delay: int, callback: Callable[[], None]) -> None:
+        """delay 毫秒后执行 callback，替换同名的待执行定时器"""
+        after_id = self._pending.pop(key, None)
+        if after_id is not None:
+            self.root.after_cancel(after_id)
+            self.replaced += 1
+        self._pending[key] = self.root.after(delay, self._fire, key, callback)
+        self.scheduled += 1
+        self.peak = max(self.peak, len(self._pending))
+
+    def _fire(self, key: str, callback: Callable[[], None]) -> None:
+        """定时器到期：先移除登记再执行，回调里可以重新排定同名定时器"""
+        self._pending.pop(key, None)
+        self.fired += 1
+        callback()
+
+    def cancel(self, key: str) -> bool:
+        """取消同名的待执行定时器，返回是否存在"""
+        after_id = self._pending.pop(key, None)
+        if after_id is None:
+            return False
+        self.root.after_cancel(after_id)
+        self.cancelled += 1
+        return True
+
+    def cancel_all(self) -> None:
+        """取消所有待执行的定时器"""
+        for key in list(self._pending):
+            self.cancel(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._pending
+
+    def __len__(self) -> int:
+        """当前存活的定时器数量"""
+        return len(self._pending)
+
+    def stats(self) -> Dict[str, int]:
+        """获取定时器统计（存活数量不会超过不同名字的数量）"""
+        return {
+            'live': len(self._pending),
+            'peak': self.peak,
+            'scheduled': self.scheduled,
+            'replaced': self.replaced,
+            'cancelled': self.cancelled,
+            'fired': self.fired,
+        }
@@ -0,0 +1,154 @@
+import time
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+
+class PointerSample(NamedTuple):
+    """一次指针采样：画布坐标和屏幕坐标"""
+    x: int
+    y: int
+    x_root: int
+    y_root: int
+
+
+class PointerSampler:
+    """指针采样：原始的移动事件只记下最新坐标，帧时钟每帧最多取一次样本
+
+    一串密集的移动事件在一帧里只被处理一次，处理成本与事件数量无关。
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.latest: Optional[PointerSample] = None  # 上次采样后的最新坐标，没有新事件时为None
+        self.first_event_time: Optional[float] = None  # 这一批事件里第一个事件到达的时刻
+        self.raw_events = 0
+        self.samples = 0
+
+    def on_event(self, event) -> None:
+        """Tk事件回调：只记下坐标"""
+        self.latest = PointerSample(event.x, event.y, event.x_root, event.y_root)
+        if self.first_event_time is None:
+            self.first_event_time = self.clock()
+        self.raw_events += 1
+
+    def sample(self) -> Optional[PointerSample]:
+        """取出最新坐标（自上次采样后没有移动时返回None）"""
+        sample = self.latest
+        if sample is not None:
+            self.latest = None
+            self.first_event_time = None
+            self.samples += 1
+        return sample
+
+    def stats(self) -> Dict[str, int]:
+        """获取原始事件数和实际使用的采样数"""
+        return {'raw_events': self.raw_events, 'samples': self.samples}
+
+
+class WindowDrag:
+    """窗口拖拽：本地记录窗口位置，拖拽事件只记下最新的目标位置，每帧最多移动一次窗口
+
+    按下时读一次窗口位置，之后的事件只用屏幕坐标做加减，不再向Tk查询。
+    从第一个未生效的事件到窗口真正移动的时间记为拖拽延迟。
+    """
+
+    def __init__(self, root, clock: Callable[[], float] = time.perf_counter):
+        self.root = root
+        self.clock = clock
+        self.active = False
+        self.position: Tuple[int, int] = (0, 0)  # 窗口当前位置（本地记录）
+        self.bounds: Tuple[int, int] = (0, 0)  # 窗口左上角允许的最大坐标
+        self.press: Tuple[int, int] = (0, 0)  # 按下时鼠标的屏幕坐标
+        self.origin: Tuple[int, int] = (0, 0)  # 按下时窗口的位置
+        self.target: Optional[Tuple[int, int]] = None  # 还没生效的最新目标位置
+        self.pending_since: Optional[float] = None
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """清零本次拖拽的统计"""
+        self.events = 0
+        self.moves = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def begin(self, x_root: int, y_root: int, bounds: Tuple[int, int]) -> None:
+        """按下鼠标时开始拖拽（唯一一次查询窗口位置）"""
+        self.active = True
+        self.bounds = bounds
+        self.press = (x_root, y_root)
+        self.origin = self.position = (self.root.winfo_x(), self.root.winfo_y())
+        self.target = None
+        self.pending_since = None
+        self.reset_stats()
+
+    def motion(self, x_root: int, y_root: int, since: Optional[float] = None) -> None:
+        """记下拖拽事件对应的目标位置（不移动窗口），since 为事件实际到达的时刻"""
+        if not self.active:
+            return
+        self.events += 1
+        x = max(0, min(self.origin[0] + x_root - self.press[0], self.bounds[0]))
+        y = max(0, min(self.origin[1] + y_root - self.press[1], self.bounds[1]))
+        if (x, y) == self.position:
+            self.target = None
+            self.pending_since = None
+            return
+        self.target = (x, y)
+        if self.pending_since is None:
+            self.pending_since = since if since is not None else self.clock()
+
+    def flush(self) -> bool:
+        """把最新的目标位置应用到窗口，返回是否移动了窗口"""
+        if self.target is None:
+            return False
+        self.root.geometry(f"+{self.target[0]}+{self.target[1]}")
+        self.position = self.target
+        latency = self.clock() - self.pending_since
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.moves += 1
+        self.target = None
+        self.pending_since = None
+        return True
+
+    def end(self) -> None:
+        """松开鼠标时结束拖拽，还没生效的位置立即应用"""
+        self.flush()
+        self.active = False
+
+    def stats(self) -> Dict[str, float]:
+        """获取本次拖拽的事件数、窗口移动次数和延迟"""
+        return {
+            'events': self.events,
+            'moves': self.moves,
+            'avg_latency_ms': round(self.total_latency * 1000 / self.moves, 2) if self.moves else 0.0,
+            'max_latency_ms': round(self.max_latency * 1000, 2),
+        }
+
+
+class CursorPoller:
+    """全局光标轮询：光标移动时按最短间隔轮询，静止时间隔按倍数退避到最长间隔"""
+
+    def __init__(self, root, min_interval: int = 33, max_interval: int = 1000, backoff: float = 2.0):
+        self.root = root
+        self.min_interval = min_interval  # 毫秒
+        self.max_interval = max_interval  # 毫秒
+        self.backoff = backoff
+        self.interval = min_interval  # 下次轮询的间隔（毫秒）
+        self.position: Optional[Tuple[int, int]] = None  # 上次轮询到的屏幕坐标
+        self.polls = 0
+        self.moves = 0
+
+    def poll(self) -> Optional[Tuple[int, int]]:
+        """查询一次光标位置，移动了返回新的屏幕坐标，否则返回None"""
+        self.polls += 1
+        position = self.root.winfo_pointerxy()
+        if position == self.position:
+            self.interval = min(self.max_interval, round(self.interval * self.backoff))
+            return None
+        self.position = position
+        self.interval = self.min_interval
+        self.moves += 1
+        return position
+
+    def stats(self) -> Dict[str, int]:
+        """获取轮询次数、检测到移动的次数和当前间隔"""
+        return {'polls': self.polls, 'moves': self.moves, 'interval_ms': self.interval}
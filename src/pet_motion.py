@@ -0,0 +1,277 @@
+import math
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import yaml
+
+# zzz动画：每秒多一个z，0~3个z循环
+ZZZ_STEP = 1.0
+ZZZ_FRAMES = 4
+
+
+class AnimationClock:
+    """动画时间基准：基于 time.monotonic，暂停期间不计时
+
+    所有动画都是动画时间的函数，可以按任意帧率采样，卡顿或跳帧不会改变动画速度。
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._start = clock()
+        self._paused_at: Optional[float] = None
+
+    def now(self) -> float:
+        """当前动画时间（秒）"""
+        if self._paused_at is not None:
+            return self._paused_at - self._start
+        return self.clock() - self._start
+
+    @property
+    def paused(self) -> bool:
+        return self._paused_at is not None
+
+    def pause(self) -> None:
+        """暂停动画时间"""
+        if self._paused_at is None:
+            self._paused_at = self.clock()
+
+    def resume(self) -> None:
+        """恢复动画时间，暂停的时长不计入"""
+        if self._paused_at is not None:
+            self._start += self.clock() - self._paused_at
+            self._paused_at = None
+
+
+def zzz_count(t: float) -> int:
+    """zzz动画当前显示几个z"""
+    return int(t / ZZZ_STEP) % ZZZ_FRAMES
+
+
+class BlinkSchedule:
+    """眨眼时间表：随机间隔后闭眼一段时间，按动画时间查询"""
+
+    def __init__(self, interval_range: Tuple[float, float], duration: float, start: float = 0.0,
+                 rng: random.Random = random):
+        self.interval_range = interval_range  # 两次眨眼之间的间隔范围（秒）
+        self.duration = duration  # 每次闭眼的时长（秒）
+        self.rng = rng
+        self.next_blink = start + self._interval()
+
+    def _interval(self) -> float:
+        return self.rng.uniform(*self.interval_range)
+
+    def is_blinking(self, t: float) -> bool:
+        """动画时间 t 时是否处于闭眼中（t 需单调不减）"""
+        # 跳过已经完整错过的眨眼（采样间隔很长时）
+        while t >= self.next_blink + self.duration:
+            self.next_blink += self.duration + self._interval()
+        return t >= self.next_blink
+
+    def peek(self, t: float) -> bool:
+        """预测动画时间 t 时是否闭眼，不推进时间表（只看下一次眨眼）"""
+        return self.next_blink <= t < self.next_blink + self.duration
+
+
+# 弹簧离目标小于这个距离（设计尺寸像素）时视为收敛
+SPRING_REST_DISTANCE = 0.5
+
+
+class CriticalSpring:
+    """二维临界阻尼弹簧：按闭式解推进，任意步长都精确、不会振荡，收敛后不再计算"""
+
+    def __init__(self, frequency: float, position: Tuple[float, float] = (0.0, 0.0),
+                 rest_distance: float = SPRING_REST_DISTANCE):
+        self.frequency = frequency  # 角频率（弧度/秒），越大跟得越快，0为直接跳到目标
+        self.rest_distance = rest_distance
+        self.position = position
+        self.velocity = (0.0, 0.0)
+        self.target = position
+        self.converged = True
+        self.last_time: Optional[float] = None
+        self.steps = 0  # 实际计算的步数
+
+    def set_target(self, target: Tuple[float, float]) -> None:
+        """设置新的目标位置"""
+        if target == self.target:
+            return
+        self.target = target
+        if self.frequency > 0:
+            self.converged = False
+        else:
+            self.position = target
+
+    def _evaluate(self, dt: float, target: Tuple[float, float]) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        """从当前状态推进 dt 秒后的位置和速度：x(t) = 目标 + (c1 + c2·t)·e^(-ωt)"""
+        w = self.frequency
+        decay = math.exp(-w * dt)
+        position, velocity = [], []
+        for x, v, goal in zip(self.position, self.velocity, target):
+            c1 = x - goal
+            c2 = v + w * c1
+            position.append(goal + (c1 + c2 * dt) * decay)
+            velocity.append((c2 - w * (c1 + c2 * dt)) * decay)
+        return (position[0], position[1]), (velocity[0], velocity[1])
+
+    def advance(self, t: float) -> Tuple[float, float]:
+        """推进到时间 t（秒，单调不减），返回当前位置"""
+        last, self.last_time = self.last_time, t
+        if self.converged or last is None:
+            return self.position
+        self.position, self.velocity = self._evaluate(t - last, self.target)
+        self.steps += 1
+        if math.dist(self.position, self.target) < self.rest_distance:
+            # 离目标不到半个像素：停在目标上，之后不再计算
+            self.position, self.velocity = self.target, (0.0, 0.0)
+            self.converged = True
+        return self.position
+
+    def peek(self, t: float, target: Optional[Tuple[float, float]] = None) -> Tuple[float, float]:
+        """预测时间 t 时的位置（可指定另一个目标），不改变弹簧状态"""
+        target = self.target if target is None else target
+        if self.frequency <= 0:
+            return target
+        if self.last_time is None:
+            return self.position
+        return self._evaluate(max(0.0, t - self.last_time), target)[0]
+
+
+# 关键帧之间的插值曲线
+EASINGS = {
+    'linear': lambda x: x,
+    'smooth': lambda x: x * x * (3 - 2 * x),
+}
+
+# 查找表默认每秒的采样数
+DEFAULT_SAMPLE_RATE = 60
+
+
+class KeyframeTrack:
+    """关键帧轨道：加载时把曲线预计算成查找表，采样只需算下标"""
+
+    def __init__(self, name: str, keys: Sequence[Sequence[float]], loop: bool = False, ease: str = 'linear',
+                 sample_rate: int = DEFAULT_SAMPLE_RATE):
+        self.name = name
+        self.loop = loop
+        self.sample_rate = sample_rate
+        keys = sorted((float(t), float(x), float(y)) for t, x, y in keys)
+        self.duration = keys[-1][0]
+        easing = EASINGS[ease]
+        count = max(1, round(self.duration * sample_rate))
+        # 循环轨道的最后一个关键帧与第一个重合，不单独占一格
+        self.table: Tuple[Tuple[float, float], ...] = tuple(
+            self._interpolate(keys, i / sample_rate, easing)
+            for i in range(count if loop else count + 1)
+        )
+
+    @staticmethod
+    def _interpolate(keys: List[Tuple[float, float, float]], t: float, easing) -> Tuple[float, float]:
+        """在关键帧之间插值（只在预计算时调用）"""
+        if t <= keys[0][0]:
+            return keys[0][1], keys[0][2]
+        for (t0, x0, y0), (t1, x1, y1) in zip(keys, keys[1:]):
+            if t <= t1:
+                k = easing((t - t0) / (t1 - t0)) if t1 > t0 else 1.0
+                return x0 + (x1 - x0) * k, y0 + (y1 - y0) * k
+        return keys[-1][1], keys[-1][2]
+
+    def sample(self, t: float) -> Tuple[float, float]:
+        """采样 t 秒时的位移"""
+        index = int(t * self.sample_rate)
+        if self.loop:
+            return self.table[index % len(self.table)]
+        return self.table[min(max(index, 0), len(self.table) - 1)]
+
+    def finished(self, t: float) -> bool:
+        """一次性轨道是否已经播完"""
+        return not self.loop and t >= self.duration
+
+
+class MotionSpec:
+    """编译后的动作描述"""
+
+    def __init__(self, tracks: Dict[str, KeyframeTrack], emotions: Dict[str, Tuple[str, ...]]):
+        self.tracks = tracks
+        self.emotions = emotions  # 表情 -> 持续播放的轨道名
+
+
+# 内置的动作描述（config/motion.yaml 缺失时使用，内容与之一致）
+DEFAULT_MOTION = {
+    'sample_rate': DEFAULT_SAMPLE_RATE,
+    'tracks': {
+        'bob': {'loop': True, 'keys': [[0, 0, 2], [1, 0, 0], [2, 0, 2]]},
+        'sway': {'loop': True, 'ease': 'smooth', 'keys': [[0, 0, 0], [1.5, -2, 1], [3, 0, 0], [4.5, 2, 1], [6, 0, 0]]},
+        'squash': {'ease': 'smooth', 'keys': [[0, 0, 0], [0.08, 0, 3], [0.2, 0, -2], [0.3, 0, 0]]},
+        'shake': {'loop': True, 'keys': [[0, 0, 0], [0.05, -2, 0], [0.15, 2, 0], [0.2, 0, 0]]},
+    },
+    'emotions': {
+        'normal': ['bob'],
+        'happy': ['bob'],
+        'sleepy': ['sway'],
+        'excited': ['bob'],
+        'thinking': ['bob'],
+        'curious': ['bob'],
+    },
+}
+
+
+def compile_motion_spec(spec: Dict[str, Any]) -> MotionSpec:
+    """把动作描述编译为预计算好的轨道"""
+    sample_rate = spec.get('sample_rate', DEFAULT_SAMPLE_RATE)
+    tracks = {
+        name: KeyframeTrack(name, track['keys'], track.get('loop', False), track.get('ease', 'linear'), sample_rate)
+        for name, track in (spec.get('tracks') or {}).items()
+    }
+    emotions = {emotion: tuple(names or ()) for emotion, names in (spec.get('emotions') or {}).items()}
+    return MotionSpec(tracks, emotions)
+
+
+def load_motion_spec(path: str) -> MotionSpec:
+    """加载并编译动作描述文件"""
+    with open(path, 'r', encoding='utf-8') as file:
+        return compile_motion_spec(yaml.safe_load(file))
+
+
+class MotionMixer:
+    """把表情轨道、一次性轨道和按住期间循环的轨道叠加成每帧一个位移"""
+
+    def __init__(self, spec: MotionSpec):
+        self.spec = spec
+        self.emotion_tracks: Tuple[KeyframeTrack, ...] = ()
+        self.active: Dict[str, Tuple[KeyframeTrack, float]] = {}  # 轨道名 -> (轨道, 开始时间)
+
+    def set_emotion(self, emotion: str) -> None:
+        """切换表情持续播放的轨道（按动画时间对齐相位，切换时不跳变节奏）"""
+        names = self.spec.emotions.get(emotion, ())
+        self.emotion_tracks = tuple(self.spec.tracks[name] for name in names if name in self.spec.tracks)
+
+    def play(self, name: str, t: float) -> None:
+        """从头播放一条轨道（正在播放时重新开始）"""
+        track = self.spec.tracks.get(name)
+        if track is not None:
+            self.active[name] = (track, t)
+
+    def hold(self, name: str, t: float) -> None:
+        """开始播放一条轨道，已在播放时保持原来的相位"""
+        if name not in self.active:
+            self.play(name, t)
+
+    def stop(self, name: str) -> None:
+        """停止一条轨道"""
+        self.active.pop(name, None)
+
+    def sample(self, t: float) -> Tuple[float, float]:
+        """采样 t 时刻所有轨道叠加后的位移"""
+        dx = dy = 0.0
+        for track in self.emotion_tracks:
+            x, y = track.sample(t)
+            dx += x
+            dy += y
+        for name, (track, start) in list(self.active.items()):
+            if track.finished(t - start):
+                del self.active[name]
+                continue
+            x, y = track.sample(t - start)
+            dx += x
+            dy += y
+        return dx, dy
@@ -0,0 +1,201 @@
+import random
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+
+class ParticleKind:
+    """一种粒子的外观和运动参数（设计尺寸单位，生成时按缩放放大）"""
+
+    def __init__(self, text: str, color: str, size: int, life: Tuple[float, float], speed: Tuple[float, float],
+                 spread: float, gravity: float, drift: float = 0.0):
+        self.text = text
+        self.color = color
+        self.size = size  # 字号
+        self.life = life  # 存活时间范围（秒）
+        self.speed = speed  # 初速度范围（像素/秒，向上为正）
+        self.spread = spread  # 水平初速度的范围（像素/秒）
+        self.gravity = gravity  # 竖直加速度（像素/秒²，向下为正）
+        self.drift = drift  # 整体水平漂移（像素/秒）
+
+
+# 粒子种类，下标即池里记录的种类编号
+PARTICLE_KINDS = {
+    'heart': ParticleKind('♥', '#FF6B9D', 12, (0.7, 1.1), (50, 80), 40, 60),
+    'sparkle': ParticleKind('✦', '#FFC83D', 10, (0.4, 0.7), (40, 110), 110, 120),
+    'zzz': ParticleKind('z', '#7A8CA8', 11, (1.8, 2.4), (12, 18), 4, 0, 6),
+}
+
+
+class ParticlePool:
+    """固定容量的粒子池：各属性存在并列的数组里，存活粒子始终排在前 count 个位置
+
+    每帧用一次遍历推进所有粒子，过期的粒子和最后一个交换后删除，不分配新对象。
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        zeros = [0.0] * capacity
+        self.x = array('d', zeros)
+        self.y = array('d', zeros)
+        self.vx = array('d', zeros)
+        self.vy = array('d', zeros)
+        self.gravity = array('d', zeros)
+        self.age = array('d', zeros)
+        self.life = array('d', zeros)
+        self.kind = array('B', bytes(capacity))
+        self.count = 0
+        self.spawned = 0
+        self.dropped = 0  # 池满时丢弃的粒子数
+
+    def spawn(self, kind: int, x: float, y: float, vx: float, vy: float, life: float, gravity: float) -> bool:
+        """放入一个粒子，池满时丢弃并返回False"""
+        i = self.count
+        if i >= self.capacity:
+            self.dropped += 1
+            return False
+        self.x[i], self.y[i], self.vx[i], self.vy[i] = x, y, vx, vy
+        self.gravity[i], self.age[i], self.life[i], self.kind[i] = gravity, 0.0, life, kind
+        self.count += 1
+        self.spawned += 1
+        return True
+
+    def _remove(self, i: int) -> None:
+        """删除第 i 个粒子：用最后一个存活的粒子填上"""
+        last = self.count - 1
+        if i != last:
+            for column in (self.x, self.y, self.vx, self.vy, self.gravity, self.age, self.life, self.kind):
+                column[i] = column[last]
+        self.count = last
+
+    def step(self, dt: float) -> None:
+        """把所有粒子推进 dt 秒，删除过期的粒子"""
+        x, y, vx, vy, gravity, age, life = self.x, self.y, self.vx, self.vy, self.gravity, self.age, self.life
+        i = 0
+        while i < self.count:
+            age[i] += dt
+            if age[i] >= life[i]:
+                # 换进来的粒子还没推进，留在原位再处理一次
+                self._remove(i)
+                continue
+            vy[i] += gravity[i] * dt
+            x[i] += vx[i] * dt
+            y[i] += vy[i] * dt
+            i += 1
+
+    def clear(self) -> None:
+        """清空所有粒子"""
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class ParticleLayer:
+    """画布上的粒子层：池里的第 i 个粒子始终画在第 i 个画布元素上
+
+    画布元素在创建时一次建好，之后只改坐标、文字和显示状态，从不新建或删除。
+    每帧的Tk调用数有硬上限，超出的部分轮流留到下一帧，连点也不会拖慢主循环。
+    """
+
+    def __init__(self, canvas, capacity: int = 24, max_calls: int = 32, scale: float = 1.0,
+                 kinds: Dict[str, ParticleKind] = PARTICLE_KINDS, rng: random.Random = random):
+        self.canvas = canvas
+        self.pool = ParticlePool(capacity)
+        self.max_calls = max_calls  # 每帧最多的Tk调用数
+        self.scale = scale
+        self.rng = rng
+        self.kinds = list(kinds.values())
+        self.kind_index = {name: index for index, name in enumerate(kinds)}
+        self.fonts = [('Segoe UI Symbol', max(1, round(kind.size * scale))) for kind in self.kinds]
+        self.items = [canvas.create_text(0, 0, text='', state='hidden') for _ in range(capacity)]
+        # 每个画布元素上次推送的 (种类, x, y)，隐藏时为None
+        self.drawn: List[Optional[Tuple[int, int, int]]] = [None] * capacity
+        self.cursor = 0  # 预算不够时下一帧从这里继续
+        self.calls = 0
+        self.deferred = 0  # 因预算不足推迟到下一帧的更新次数
+
+    def emit(self, name: str, x: float, y: float, count: int) -> int:
+        """在画布坐标 (x, y) 附近放出 count 个粒子，返回实际放出的数量"""
+        index = self.kind_index[name]
+        kind = self.kinds[index]
+        uniform, scale = self.rng.uniform, self.scale
+        emitted = 0
+        for _ in range(count):
+            emitted += self.pool.spawn(
+                index,
+                x + uniform(-6, 6) * scale,
+                y + uniform(-4, 4) * scale,
+                (kind.drift + uniform(-kind.spread, kind.spread) / 2) * scale,
+                -uniform(*kind.speed) * scale,
+                uniform(*kind.life),
+                kind.gravity * scale,
+            )
+        return emitted
+
+    def update(self, dt: float) -> int:
+        """推进所有粒子并在预算内推送到画布，返回Tk调用次数"""
+        if not self.pool.count and not any(self.drawn):
+            return 0
+        self.pool.step(dt)
+        pool, drawn, items = self.pool, self.drawn, self.items
+        capacity = pool.capacity
+        calls = 0
+        start = self.cursor
+        for n in range(capacity):
+            i = (start + n) % capacity
+            if i < pool.count:
+                target = (pool.kind[i], round(pool.x[i]), round(pool.y[i]))
+            else:
+                target = None
+            current = drawn[i]
+            if target == current:
+                continue
+            # 换种类或重新显示时多一次itemconfig
+            cost = 2 if target is not None and (current is None or target[0] != current[0]) else 1
+            if calls + cost > self.max_calls:
+                # 预算用完：剩下的元素下一帧从这里开始推送
+                self.cursor = i
+                self.deferred += 1
+                break
+            if target is None:
+                self.canvas.itemconfig(items[i], state='hidden')
+            else:
+                if current is None or target[0] != current[0]:
+                    kind = self.kinds[target[0]]
+                    self.canvas.itemconfig(items[i], text=kind.text, fill=kind.color, font=self.fonts[target[0]],
+                                           state='normal')
+                self.canvas.coords(items[i], target[1], target[2])
+            drawn[i] = target
+            calls += cost
+        else:
+            self.cursor = 0
+        self.calls += calls
+        return calls
+
+    def clear(self) -> None:
+        """清空粒子并隐藏所有画布元素"""
+        self.pool.clear()
+        for i, item in enumerate(self.items):
+            if self.drawn[i] is not None:
+                self.canvas.itemconfig(item, state='hidden')
+                self.drawn[i] = None
+        self.cursor = 0
+
+    def destroy(self) -> None:
+        """删除画布元素（切换缩放重建粒子层时调用）"""
+        for item in self.items:
+            self.canvas.delete(item)
+
+    def __len__(self) -> int:
+        return len(self.pool)
+
+    def stats(self) -> Dict[str, int]:
+        """获取粒子统计"""
+        return {
+            'live': len(self.pool),
+            'capacity': self.pool.capacity,
+            'spawned': self.pool.spawned,
+            'dropped': self.pool.dropped,
+            'calls': self.calls,
+            'deferred': self.deferred,
+        }
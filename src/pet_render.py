@@ -0,0 +1,1112 @@
+import hashlib
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import PIL
+import yaml
+from PIL import Image, ImageDraw, ImageFont, ImageTk, PngImagePlugin
+
+# 精灵图像尺寸
+SPRITE_SIZE = 80
+# zzz动画：0~3个z循环
+Z_FRAMES = 4
+
+# 编译后的绘制指令：(绘制方法, 坐标, 绘制参数)
+DrawOp = Tuple[Callable, tuple, Dict[str, Any]]
+
+# 默认字体在设计尺寸下的字号
+DEFAULT_FONT_SIZE = 10
+
+# 磁盘精灵缓存的格式版本，改动缓存布局或渲染流程时递增
+SPRITE_CACHE_VERSION = 2
+# 精灵表中保存帧索引的PNG文本块名
+SPRITE_INDEX_CHUNK = 'cute_pet_index'
+
+# 透明度不低于该值的像素才算点在宠物身上
+ALPHA_HIT_THRESHOLD = 64
+
+
+class GlyphCache:
+    """文字蒙版缓存：同一字体、字号和亚像素起点下的每个字符串只光栅化一次"""
+
+    def __init__(self):
+        self._masks: Dict[tuple, Optional[Tuple[Image.Image, Tuple[int, int]]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def mask(self, text: str, font, start: Tuple[float, float]) -> Optional[Tuple[Image.Image, Tuple[int, int]]]:
+        """获取 (文字蒙版, 相对绘制点的整数偏移)，空白文字返回None"""
+        key = (text, font, start)
+        if key in self._masks:
+            self.hits += 1
+            return self._masks[key]
+
+        self.misses += 1
+        # 在留有边距的L图像上按相同的亚像素起点画一次，再裁掉空白
+        left, top, right, bottom = (math.ceil(abs(v)) for v in font.getbbox(text))
+        margin_x, margin_y = left + 2, top + 2
+        canvas = Image.new('L', (margin_x + right + 2, margin_y + bottom + 2), 0)
+        ImageDraw.Draw(canvas).text((margin_x + start[0], margin_y + start[1]), text, fill=255, font=font)
+        bbox = canvas.getbbox()
+        glyph = None
+        if bbox is not None:
+            glyph = (canvas.crop(bbox), (bbox[0] - margin_x, bbox[1] - margin_y))
+        self._masks[key] = glyph
+        return glyph
+
+    def __len__(self) -> int:
+        return len(self._masks)
+
+
+# 全局文字蒙版缓存（字体对象按缩放倍数缓存，键中的字体始终存活）
+glyph_cache = GlyphCache()
+
+
+def draw_glyph(draw: ImageDraw.ImageDraw, xy: tuple, text: str, fill=None, font=None, **params) -> None:
+    """绘制文字：从蒙版缓存贴图，与 ImageDraw.text 的结果逐像素一致"""
+    if font is None or params or draw.fontmode != 'L':
+        # 带排版参数或非灰度字体模式时退回逐次光栅化
+        draw.text(xy, text, fill=fill, font=font, **params)
+        return
+    x, y = xy
+    glyph = glyph_cache.mask(text, font, (math.modf(x)[0], math.modf(y)[0]))
+    if glyph is None:
+        return
+    mask, (offset_x, offset_y) = glyph
+    draw.bitmap((int(x) + offset_x, int(y) + offset_y), mask, fill=fill)
+
+
+# 外观描述中的图形名称对应的绘制方法
+DRAW_METHODS = {
+    'ellipse': ImageDraw.ImageDraw.ellipse,
+    'arc': ImageDraw.ImageDraw.arc,
+    'line': ImageDraw.ImageDraw.line,
+    'rectangle': ImageDraw.ImageDraw.rectangle,
+    'polygon': ImageDraw.ImageDraw.polygon,
+    'text': draw_glyph,
+}
+
+
+def pupil_grid(max_radius: int) -> List[Tuple[int, int]]:
+    """生成最大半径内所有整数眼球偏移格点"""
+    return [
+        (dx, dy)
+        for dy in range(-max_radius, max_radius + 1)
+        for dx in range(-max_radius, max_radius + 1)
+        if dx * dx + dy * dy <= max_radius * max_radius
+    ]
+
+
+def snap_pupil(dx: float, dy: float, max_radius: int) -> Tuple[int, int]:
+    """把连续的眼球偏移量化到最近的格点（保证落在半径内）"""
+    cx, cy = int(round(dx)), int(round(dy))
+    r2 = max_radius * max_radius
+    while cx * cx + cy * cy > r2:
+        # 四舍五入可能越界，沿较大分量向中心收缩
+        if abs(cx) >= abs(cy):
+            cx -= 1 if cx > 0 else -1
+        else:
+            cy -= 1 if cy > 0 else -1
+    return cx, cy
+
+
+class EyeSpec(NamedTuple):
+    """编译后的眼睛描述"""
+    anchor: Tuple[float, float, float]  # 跟踪锚点X, Y 和鼠标Y方向的偏置
+    whites: Tuple[tuple, ...]  # 眼白框
+    pupils: Tuple[Tuple[float, float, float], ...]  # 眼球(中心X, 中心Y, 半径)
+    closed: Tuple[tuple, ...]  # 闭眼横线
+    open_ops: Tuple[DrawOp, ...]  # 睁眼时的眼白绘制指令
+    closed_ops: Tuple[DrawOp, ...]  # 眨眼时的横线绘制指令
+
+
+class FaceSpec:
+    """编译后的外观描述：每种表情一组扁平的绘制指令"""
+
+    def __init__(self, digest: str, size: int, base_ops: Dict[str, List[Tuple[DrawOp, ...]]],
+                 eyes: Dict[str, Optional[EyeSpec]], eye_style: Dict[str, dict], tray: dict,
+                 scale: float = 1.0, design: Optional['FaceSpec'] = None):
+        self.digest = digest  # 外观描述的内容哈希
+        self.size = size  # 精灵的像素尺寸
+        self.base_ops = base_ops  # 表情 -> 按zzz帧排列的静态图层指令
+        self.eyes = eyes
+        self.eye_style = eye_style
+        self.tray = tray
+        self.pupil_fill = eye_style['pupil'].get('fill', 'black')
+        self.scale = scale  # 相对设计尺寸的缩放倍数
+        self.design = design or self  # 设计尺寸下的原始描述
+        self._scaled: Dict[float, 'FaceSpec'] = {}
+
+    @property
+    def emotions(self) -> List[str]:
+        return list(self.base_ops)
+
+    def z_frames(self, emotion: str) -> int:
+        """表情静态图层的动画帧数（带zzz动画的表情为 Z_FRAMES，其余为1）"""
+        return len(self.base_ops[emotion])
+
+    def normalize_key(self, emotion: str, blink: bool, pupil: Tuple[int, int], z_count: int) -> tuple:
+        """把任意状态归一化为精灵键（与当前表情无关的维度折叠掉）"""
+        z_count %= len(self.base_ops[emotion])
+        if self.eyes.get(emotion) is None:
+            return (emotion, False, (0, 0), z_count)
+        if blink:
+            return (emotion, True, (0, 0), z_count)
+        return (emotion, False, pupil, z_count)
+
+    def scaled(self, scale: float) -> 'FaceSpec':
+        """获取相对设计尺寸缩放后的描述（每个缩放倍数只编译一次）"""
+        design = self.design
+        scale = round(scale, 3)
+        if scale == 1.0:
+            return design
+        cached = design._scaled.get(scale)
+        if cached is not None:
+            return cached
+
+        base_ops = {
+            emotion: [tuple(_scale_op(op, scale) for op in ops) for ops in variants]
+            for emotion, variants in design.base_ops.items()
+        }
+        eyes = {}
+        for emotion, eye_spec in design.eyes.items():
+            if eye_spec is None:
+                eyes[emotion] = None
+                continue
+            anchor_x, anchor_y, bias_y = eye_spec.anchor
+            eyes[emotion] = EyeSpec(
+                anchor=(anchor_x * scale, anchor_y * scale, bias_y * scale),
+                whites=tuple(_scale_xy(box, scale) for box in eye_spec.whites),
+                pupils=tuple(_scale_xy(pupil, scale) for pupil in eye_spec.pupils),
+                closed=tuple(_scale_xy(line, scale) for line in eye_spec.closed),
+                open_ops=tuple(_scale_op(op, scale) for op in eye_spec.open_ops),
+                closed_ops=tuple(_scale_op(op, scale) for op in eye_spec.closed_ops),
+            )
+        eye_style = {name: _scale_params(style, scale) for name, style in design.eye_style.items()}
+
+        scaled = FaceSpec(design.digest, max(1, round(design.size * scale)), base_ops, eyes,
+                          eye_style, design.tray, scale, design)
+        design._scaled[scale] = scaled
+        return scaled
+
+
+def _scale_xy(xy: tuple, scale: float) -> tuple:
+    """缩放坐标"""
+    return tuple(v * scale for v in xy)
+
+
+def _scale_params(params: Dict[str, Any], scale: float) -> Dict[str, Any]:
+    """缩放线宽（带描边的图形默认线宽为1，也要一起放大）"""
+    params = dict(params)
+    if 'width' in params or params.get('outline'):
+        params['width'] = max(1, round(params.get('width', 1) * scale))
+    return params
+
+
+@lru_cache(maxsize=None)
+def _scaled_font(scale: float):
+    """获取缩放后的默认字体（旧版Pillow不支持指定字号时退回位图字体）"""
+    try:
+        return ImageFont.load_default(size=DEFAULT_FONT_SIZE * scale)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def _scale_op(op: DrawOp, scale: float) -> DrawOp:
+    """缩放一条绘制指令"""
+    method, xy, params = op
+    params = _scale_params(params, scale)
+    if method is draw_glyph:
+        params['font'] = _scaled_font(scale)
+    return (method, _scale_xy(xy, scale), params)
+
+
+def _flatten_ops(items) -> Iterator[dict]:
+    """展开嵌套的指令列表（YAML锚点复用的部件是嵌套列表）"""
+    for op in items or []:
+        if isinstance(op, list):
+            yield from _flatten_ops(op)
+        else:
+            yield op
+
+
+def _compile_op(op: dict, z_count: int = 0) -> Optional[DrawOp]:
+    """把一条绘制指令编译为 (绘制方法, 坐标, 参数) 元组"""
+    params = {k: v for k, v in op.items() if k not in ('shape', 'xy', 'repeat')}
+    if op.get('repeat') == 'zzz':
+        params['text'] = params['text'] * z_count
+        if not params['text']:
+            return None
+    if op['shape'] == 'text':
+        # 固定字体对象，文字蒙版才能按字体缓存
+        params.setdefault('font', _scaled_font(1.0))
+    return (DRAW_METHODS[op['shape']], tuple(op['xy']), params)
+
+
+def compile_face_spec(spec: Dict[str, Any]) -> FaceSpec:
+    """把外观描述编译为扁平的绘制指令"""
+    raw = json.dumps(spec, sort_keys=True, ensure_ascii=False)
+    digest = hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    cached = _compiled_specs.get(digest)
+    if cached is not None:
+        return cached
+
+    eye_style = spec.get('eye_style', {})
+    white_style = eye_style.get('white', {'fill': '#FFFEFA', 'outline': 'black'})
+    closed_style = eye_style.get('closed', {'fill': 'black', 'width': 3})
+    eye_style = {'white': white_style, 'closed': closed_style, 'pupil': eye_style.get('pupil', {'fill': 'black'})}
+
+    base_ops = {}
+    eyes = {}
+    for emotion, emotion_spec in spec['emotions'].items():
+        ops = list(_flatten_ops(emotion_spec.get('base')))
+        # 带zzz动画的表情按帧各编译一份，运行时只按下标取
+        animated = any(op.get('repeat') == 'zzz' for op in ops)
+        base_ops[emotion] = [
+            tuple(c for c in (_compile_op(op, z_count) for op in ops) if c is not None)
+            for z_count in range(Z_FRAMES if animated else 1)
+        ]
+
+        eye_spec = emotion_spec.get('eyes')
+        if not eye_spec:
+            eyes[emotion] = None
+            continue
+        anchor_x, anchor_y = eye_spec['anchor']
+        _, bias_y = eye_spec.get('look_bias', [0, 0])
+        whites = tuple(tuple(box) for box in eye_spec['whites'])
+        closed = tuple(tuple(line) for line in eye_spec['closed'])
+        eyes[emotion] = EyeSpec(
+            anchor=(anchor_x, anchor_y, bias_y),
+            whites=whites,
+            pupils=tuple(tuple(p) for p in eye_spec['pupils']),
+            closed=closed,
+            open_ops=tuple((ImageDraw.ImageDraw.ellipse, box, white_style) for box in whites),
+            closed_ops=tuple((ImageDraw.ImageDraw.line, line, closed_style) for line in closed),
+        )
+
+    tray = dict(spec.get('tray', {}))
+    tray['ops'] = tuple(_compile_op(op) for op in _flatten_ops(tray.get('ops')))
+
+    face_spec = FaceSpec(digest, spec.get('sprite_size', SPRITE_SIZE), base_ops, eyes, eye_style, tray)
+    _compiled_specs[digest] = face_spec
+    return face_spec
+
+
+# 已编译的外观描述，按内容哈希缓存
+_compiled_specs: Dict[str, FaceSpec] = {}
+
+
+# 内置的外观描述（config/appearance.yaml 缺失时使用，内容与之一致）
+_CHEEKS = [  # 可爱的腮红
+    {'shape': 'ellipse', 'xy': [15, 45, 25, 55], 'fill': '#FF9999'},
+    {'shape': 'ellipse', 'xy': [55, 45, 65, 55], 'fill': '#FF9999'},
+]
+_ROUND_EYES = {  # 普通的圆眼睛
+    'anchor': [40, 35],
+    'whites': [[25, 30, 35, 40], [45, 30, 55, 40]],
+    'pupils': [[30, 35, 2], [50, 35, 2]],
+    'closed': [[25, 35, 35, 35], [45, 35, 55, 35]],
+}
+DEFAULT_APPEARANCE = {
+    'sprite_size': 80,
+    'eye_style': {
+        'white': {'fill': '#FFFEFA', 'outline': 'black'},
+        'pupil': {'fill': 'black'},
+        'closed': {'fill': 'black', 'width': 3},
+    },
+    'parts': {'cheeks': _CHEEKS, 'round_eyes': _ROUND_EYES},
+    'emotions': {
+        'normal': {
+            'base': [
+                {'shape': 'ellipse', 'xy': [10, 20, 70, 70], 'fill': '#4CAF50', 'outline': '#2E7D32', 'width': 2},
+                {'shape': 'arc', 'xy': [35, 45, 45, 55], 'start': 0, 'end': 180, 'fill': 'black', 'width': 2},
+            ],
+            'eyes': _ROUND_EYES,
+        },
+        'happy': {
+            'base': [
+                {'shape': 'ellipse', 'xy': [10, 20, 70, 70], 'fill': '#FFC107', 'outline': '#FF8F00', 'width': 2},
+                {'shape': 'arc', 'xy': [30, 40, 50, 60], 'start': 0, 'end': 180, 'fill': 'black', 'width': 3},
+                _CHEEKS,
+            ],
+            'eyes': _ROUND_EYES,
+        },
+        'sleepy': {
+            'base': [
+                {'shape': 'ellipse', 'xy': [10, 20, 70, 70], 'fill': '#2196F3', 'outline': '#0D47A1', 'width': 2},
+                {'shape': 'ellipse', 'xy': [25, 33, 35, 37], 'fill': '#FFFEFA', 'outline': 'black'},
+                {'shape': 'ellipse', 'xy': [45, 33, 55, 37], 'fill': '#FFFEFA', 'outline': 'black'},
+                {'shape': 'line', 'xy': [25, 35, 35, 35], 'fill': 'black', 'width': 2},
+                {'shape': 'line', 'xy': [45, 35, 55, 35], 'fill': 'black', 'width': 2},
+                {'shape': 'ellipse', 'xy': [38, 48, 42, 52], 'fill': 'black'},
+                {'shape': 'text', 'xy': [55, 15], 'text': 'z', 'repeat': 'zzz', 'fill': 'black'},
+            ],
+        },
+        'excited': {
+            'base': [
+                {'shape': 'ellipse', 'xy': [10, 20, 70, 70], 'fill': '#F44336', 'outline': '#B71C1C', 'width': 2},
+                {'shape': 'ellipse', 'xy': [35, 45, 45, 55], 'fill': 'black'},
+                _CHEEKS,
+            ],
+            'eyes': {
+                'anchor': [40, 32.5],
+                'whites': [[20, 25, 35, 40], [45, 25, 60, 40]],
+                'pupils': [[27.5, 32.5, 2.5], [52.5, 32.5, 2.5]],
+                'closed': [[20, 32, 35, 32], [45, 32, 60, 32]],
+            },
+        },
+        'thinking': {
+            'base': [
+                {'shape': 'ellipse', 'xy': [10, 20, 70, 70], 'fill': '#9C27B0', 'outline': '#4A148C', 'width': 2},
+                {'shape': 'arc', 'xy': [35, 50, 45, 55], 'start': 0, 'end': 180, 'fill': 'black', 'width': 2},
+                {'shape': 'ellipse', 'xy': [55, 10, 65, 20], 'fill': 'white', 'outline': 'black'},
+                {'shape': 'text', 'xy': [57, 12], 'text': '?', 'fill': 'black'},
+            ],
+            'eyes': {
+                'anchor': [40, 32],
+                'look_bias': [0, -5],
+                'whites': [[25, 30, 35, 40], [45, 30, 55, 40]],
+                'pupils': [[30, 32, 2], [50, 32, 2]],
+                'closed': [[25, 32, 35, 32], [45, 32, 55, 32]],
+            },
+        },
+        'curious': {
+            'base': [
+                {'shape': 'ellipse', 'xy': [10, 20, 70, 70], 'fill': '#FF9800', 'outline': '#E65100', 'width': 2},
+                {'shape': 'ellipse', 'xy': [37, 47, 43, 53], 'fill': 'black'},
+                {'shape': 'text', 'xy': [60, 15], 'text': '!', 'fill': 'black'},
+                _CHEEKS,
+            ],
+            'eyes': {
+                'anchor': [39, 35],
+                'whites': [[22, 28, 36, 42], [44, 30, 54, 40]],
+                'pupils': [[29, 35, 3], [49, 35, 2]],
+                'closed': [[22, 35, 36, 35], [44, 35, 54, 35]],
+            },
+        },
+    },
+    'tray': {
+        'size': [64, 64],
+        'mode': 'RGB',
+        'background': 'white',
+        'ops': [
+            {'shape': 'ellipse', 'xy': [5, 15, 55, 55], 'fill': '#4CAF50', 'outline': '#2E7D32', 'width': 2},
+            {'shape': 'ellipse', 'xy': [15, 25, 25, 35], 'fill': 'white', 'outline': 'black'},
+            {'shape': 'ellipse', 'xy': [35, 25, 45, 35], 'fill': 'white', 'outline': 'black'},
+            {'shape': 'ellipse', 'xy': [18, 28, 22, 32], 'fill': 'black'},
+            {'shape': 'ellipse', 'xy': [38, 28, 42, 32], 'fill': 'black'},
+            {'shape': 'arc', 'xy': [25, 35, 35, 45], 'start': 0, 'end': 180, 'fill': 'black', 'width': 2},
+            {'shape': 'ellipse', 'xy': [8, 35, 15, 42], 'fill': '#FF9999'},
+            {'shape': 'ellipse', 'xy': [45, 35, 52, 42], 'fill': '#FF9999'},
+        ],
+    },
+}
+
+
+def load_face_spec(path: str) -> FaceSpec:
+    """加载并编译外观描述文件"""
+    with open(path, 'r', encoding='utf-8') as file:
+        return compile_face_spec(yaml.safe_load(file))
+
+
+def run_ops(draw: ImageDraw.ImageDraw, ops) -> None:
+    """依次执行编译好的绘制指令"""
+    for method, xy, params in ops:
+        method(draw, xy, **params)
+
+
+def draw_pet_base(draw: ImageDraw.ImageDraw, spec: FaceSpec, emotion: str, z_count: int) -> None:
+    """绘制宠物的静态部分（身体、嘴巴、腮红和装饰，不含会动的眼睛）"""
+    variants = spec.base_ops[emotion]
+    run_ops(draw, variants[z_count % len(variants)])
+
+
+def draw_pet_eyes(draw: ImageDraw.ImageDraw, spec: FaceSpec, emotion: str, blink: bool,
+                  pupil: Tuple[float, float]) -> None:
+    """绘制会动的眼睛（睁眼时眼白加眼球，眨眼时横线）"""
+    eyes = spec.eyes.get(emotion)
+    if eyes is None:
+        return
+    if blink:
+        run_ops(draw, eyes.closed_ops)
+        return
+    run_ops(draw, eyes.open_ops)
+    # 眼球偏移以设计尺寸为单位
+    px, py = pupil[0] * spec.scale, pupil[1] * spec.scale
+    for x, y, r in eyes.pupils:
+        draw.ellipse([x+px-r, y+py-r, x+px+r, y+py+r], fill=spec.pupil_fill)
+
+
+def draw_pet_frame(draw: ImageDraw.ImageDraw, spec: FaceSpec, emotion: str, blink: bool,
+                   pupil: Tuple[float, float], z_count: int) -> None:
+    """绘制一帧完整的宠物图像"""
+    draw_pet_base(draw, spec, emotion, z_count)
+    draw_pet_eyes(draw, spec, emotion, blink, pupil)
+
+
+def snap_alpha(img: Image.Image) -> Image.Image:
+    """把透明度二值化（原地修改并返回）
+
+    窗口只把纯白当作透明色，半透明的像素会和白色混合，在深色桌面上留下一圈白边；
+    二值化后颜色仍保留抗锯齿，像素只有完全不透明和完全透明两种。
+    """
+    img.putalpha(img.getchannel('A').point(lambda a: 255 if a >= 128 else 0))
+    return img
+
+
+def downsample(img: Image.Image, size: int) -> Image.Image:
+    """把超采样的图像缩小到 size（透明度二值化）"""
+    return snap_alpha(img.resize((size, size), Image.LANCZOS))
+
+
+def render_sprite(spec: FaceSpec, emotion: str, blink: bool, pupil: Tuple[float, float],
+                  z_count: int, supersample: int = 1) -> Image.Image:
+    """按描述的尺寸渲染一帧精灵（超采样后缩小以抗锯齿）"""
+    hi = spec.scaled(spec.scale * supersample) if supersample > 1 else spec
+    img = Image.new('RGBA', (hi.size, hi.size), (255, 255, 255, 0))
+    draw_pet_frame(ImageDraw.Draw(img), hi, emotion, blink, pupil, z_count)
+    if hi is not spec:
+        img = downsample(img, spec.size)
+    return img
+
+
+def render_base_layer(spec: FaceSpec, emotion: str, z_count: int, supersample: int = 1) -> Image.Image:
+    """按描述的尺寸渲染表情的静态图层（超采样后缩小以抗锯齿）"""
+    hi = spec.scaled(spec.scale * supersample) if supersample > 1 else spec
+    img = Image.new('RGBA', (hi.size, hi.size), (255, 255, 255, 0))
+    draw_pet_base(ImageDraw.Draw(img), hi, emotion, z_count)
+    if hi is not spec:
+        img = downsample(img, spec.size)
+    return img
+
+
+def render_tray_icon(spec: FaceSpec) -> Image.Image:
+    """渲染托盘图标"""
+    tray = spec.tray
+    img = Image.new(tray.get('mode', 'RGB'), tuple(tray.get('size', (64, 64))), color=tray.get('background', 'white'))
+    run_ops(ImageDraw.Draw(img), tray['ops'])
+    return img
+
+
+def render_sprite_frames(spec: FaceSpec, emotions: List[str], mode: str, max_radius: int = 3,
+                         supersample: int = 1) -> Dict[tuple, Image.Image]:
+    """渲染一个缩放倍数下渲染模式需要的全部帧
+
+    键为 (表情, 眨眼, 眼球格点, zzz帧) 的是整张精灵，键为 (表情, zzz帧) 的是静态底图。
+    """
+    frames: Dict[tuple, Image.Image] = {}
+    if mode == 'atlas':
+        for key in SpriteAtlas(spec, emotions, max_radius).keys():
+            frames[key] = render_sprite(spec, *key, supersample=supersample)
+    else:
+        for emotion in emotions:
+            for z_count in range(spec.z_frames(emotion)):
+                frames[(emotion, z_count)] = render_base_layer(spec, emotion, z_count, supersample)
+    # 表情的默认图像（眼睛看向正前方）
+    for emotion in emotions:
+        key = spec.normalize_key(emotion, False, (0, 0), 0)
+        if key not in frames:
+            frames[key] = render_sprite(spec, *key, supersample=supersample)
+    return frames
+
+
+def default_cache_dir() -> str:
+    """获取当前用户的缓存目录"""
+    if sys.platform == 'win32':
+        root = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~\\AppData\\Local')
+    elif sys.platform == 'darwin':
+        root = os.path.expanduser('~/Library/Caches')
+    else:
+        root = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(root, 'cute_pet', 'sprites')
+
+
+def _encode_frame_key(key: tuple) -> list:
+    """把帧键转换为可写入JSON的列表"""
+    return [list(v) if isinstance(v, tuple) else v for v in key]
+
+
+def _decode_frame_key(key: list) -> tuple:
+    """把JSON中的帧键还原为元组"""
+    return tuple(tuple(v) if isinstance(v, list) else v for v in key)
+
+
+class SpriteDiskCache:
+    """磁盘精灵缓存：每组帧拼成一张PNG精灵表，帧索引写在PNG文本块里
+
+    缓存键是外观描述、尺寸、渲染参数和Pillow版本的哈希，任何一项变化都会换一个文件，
+    旧文件不会被误用。写入先落到临时文件再原子替换，不会留下写了一半的缓存。
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, spec: FaceSpec, mode: str, emotions: List[str], max_radius: int, supersample: int) -> str:
+        """计算一组帧的缓存键"""
+        raw = json.dumps({
+            'version': SPRITE_CACHE_VERSION,
+            'pillow': PIL.__version__,
+            'spec': spec.digest,
+            'size': spec.size,
+            'scale': spec.scale,
+            'mode': mode,
+            'emotions': list(emotions),
+            'max_radius': max_radius,
+            'supersample': supersample,
+        }, sort_keys=True)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def path(self, key: str) -> str:
+        """缓存键对应的精灵表路径"""
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def load(self, key: str) -> Optional[Dict[tuple, Image.Image]]:
+        """一次读入精灵表并切分为帧，缓存不存在或已损坏时返回None"""
+        try:
+            with Image.open(self.path(key)) as sheet:
+                sheet.load()
+                index = json.loads(sheet.text[SPRITE_INDEX_CHUNK])
+                size = index['size']
+                frames = {}
+                for entry in index['frames']:
+                    x, y = entry['box']
+                    frames[_decode_frame_key(entry['key'])] = sheet.crop((x, y, x + size, y + size))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return frames
+
+    def store(self, key: str, frames: Dict[tuple, Image.Image]) -> bool:
+        """把帧拼成精灵表原子写入缓存目录，写入失败不影响运行"""
+        if not frames:
+            return False
+        size = next(iter(frames.values())).width
+        columns = math.ceil(math.sqrt(len(frames)))
+        rows = math.ceil(len(frames) / columns)
+        sheet = Image.new('RGBA', (columns * size, rows * size), (255, 255, 255, 0))
+        entries = []
+        for i, (frame_key, frame) in enumerate(frames.items()):
+            box = ((i % columns) * size, (i // columns) * size)
+            sheet.paste(frame, box)
+            entries.append({'key': _encode_frame_key(frame_key), 'box': box})
+        info = PngImagePlugin.PngInfo()
+        info.add_text(SPRITE_INDEX_CHUNK, json.dumps({'size': size, 'frames': entries}))
+
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.cache_dir)
+            with os.fdopen(fd, 'wb') as file:
+                sheet.save(file, format='PNG', pnginfo=info)
+            os.replace(tmp_path, self.path(key))
+            return True
+        except OSError as e:
+            print(f"写入精灵缓存失败: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+
+class RenderState:
+    """渲染状态：记录已推送给Tk的各个维度，只有值变化时才标记为脏"""
+
+    FIELDS = ('emotion', 'blink', 'pupil', 'offset', 'zzz', 'fade')
+    SPRITE_FIELDS = ('emotion', 'blink', 'pupil', 'zzz', 'fade')
+
+    def __init__(self):
+        self.emotion = None
+        self.blink = False
+        self.pupil = (0, 0)
+        self.offset = (0, 0)  # 动作轨道叠加后的位移
+        self.zzz = 0
+        self.fade = None  # 表情切换中时为 (原表情, 新表情, 过渡帧下标)
+        # 初始时全部为脏，保证第一帧一定会推送
+        self.dirty = set(self.FIELDS)
+
+    def update(self, **values) -> None:
+        """写入新状态，只有发生变化的字段才会被标记为脏"""
+        for name, value in values.items():
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                self.dirty.add(name)
+
+    def is_dirty(self, *names: str) -> bool:
+        """判断指定字段中是否有脏字段"""
+        return any(name in self.dirty for name in names)
+
+    def clear(self, *names: str) -> None:
+        """推送完成后清除脏标记"""
+        self.dirty.difference_update(names)
+
+    def sprite_key(self) -> tuple:
+        """当前精灵图像对应的图集键"""
+        return (self.emotion, self.blink, self.pupil, self.zzz)
+
+
+class PhotoImageCache:
+    """有容量上限的Tk图像LRU缓存，键为 (表情, 眨眼, 眼球格点, zzz帧)"""
+
+    def __init__(self, max_size: int = 160):
+        # 至少保留两张：当前显示的一张不能被淘汰
+        self.max_size = max(2, max_size)
+        self._items: 'OrderedDict[tuple, ImageTk.PhotoImage]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple, factory: Callable[[], Image.Image]) -> ImageTk.PhotoImage:
+        """获取缓存的Tk图像，未命中时由factory提供PIL图像并创建"""
+        photo = self._items.get(key)
+        if photo is not None:
+            self.hits += 1
+            self._items.move_to_end(key)
+            return photo
+
+        self.misses += 1
+        photo = ImageTk.PhotoImage(factory())
+        self._items[key] = photo
+        if len(self._items) > self.max_size:
+            # 淘汰最久未使用的图像
+            self._items.popitem(last=False)
+            self.evictions += 1
+        return photo
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> Dict[str, int]:
+        """获取缓存统计（稳定状态下misses不应再增长）"""
+        return {
+            'size': len(self._items),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+class SpriteAtlas:
+    """预渲染精灵图集：启动时一次性生成 表情×眨眼×眼球偏移×zzz 的所有帧"""
+
+    def __init__(self, spec: FaceSpec, emotions: List[str], max_radius: int = 3, photo_cache_size: int = 160,
+                 supersample: int = 1):
+        self.spec = spec
+        self.emotions = list(emotions)
+        self.max_radius = max_radius
+        self.supersample = supersample
+        self.pupil_cells = pupil_grid(max_radius)
+        self.frames: Dict[tuple, Image.Image] = {}
+        # Tk图像按需创建，由LRU缓存限制数量
+        self.photos = PhotoImageCache(photo_cache_size)
+
+    def key(self, emotion: str, blink: bool, pupil: Tuple[int, int], z_count: int) -> tuple:
+        """把任意状态归一化为图集键"""
+        return self.spec.normalize_key(emotion, blink, pupil, z_count)
+
+    def keys(self) -> Iterator[tuple]:
+        """枚举图集中的所有键"""
+        for emotion in self.emotions:
+            for z_count in range(self.spec.z_frames(emotion)):
+                if self.spec.eyes.get(emotion) is None:
+                    yield self.key(emotion, False, (0, 0), z_count)
+                    continue
+                yield self.key(emotion, True, (0, 0), z_count)
+                for cell in self.pupil_cells:
+                    yield self.key(emotion, False, cell, z_count)
+
+    def build(self, frames: Optional[Dict[tuple, Image.Image]] = None) -> 'SpriteAtlas':
+        """渲染所有帧（已有缓存帧时直接使用，只补渲染缺少的帧）"""
+        frames = frames or {}
+        for key in self.keys():
+            frame = frames.get(key)
+            self.frames[key] = frame if frame is not None else render_sprite(self.spec, *key, supersample=self.supersample)
+        return self
+
+    def snap(self, dx: float, dy: float) -> Tuple[int, int]:
+        """量化眼球偏移到图集格点"""
+        return snap_pupil(dx, dy, self.max_radius)
+
+    def photo(self, key: tuple) -> ImageTk.PhotoImage:
+        """查表获取帧对应的Tk图像"""
+        return self.photos.get(key, lambda: self.frames[key])
+
+
+class FrameCompositor:
+    """增量合成：把缓存的表情底图贴进预分配的缓冲区，再用复用的画笔只画眼睛"""
+
+    def __init__(self, spec: FaceSpec, supersample: int = 1):
+        self.spec = spec
+        self.supersample = supersample
+        # 整个生命周期只分配一块缓冲区和一个画笔
+        self.buffer = Image.new('RGBA', (spec.size, spec.size), (255, 255, 255, 0))
+        self.draw = ImageDraw.Draw(self.buffer)
+        self.base_layers: Dict[Tuple[str, int], Image.Image] = {}
+
+    def base_layer(self, emotion: str, z_count: int) -> Image.Image:
+        """获取表情底图（首次使用时渲染并缓存）"""
+        key = (emotion, z_count)
+        layer = self.base_layers.get(key)
+        if layer is None:
+            layer = render_base_layer(self.spec, emotion, z_count, self.supersample)
+            self.base_layers[key] = layer
+        return layer
+
+    def render(self, emotion: str, blink: bool, pupil: Tuple[float, float], z_count: int) -> Image.Image:
+        """合成一帧到缓冲区并返回缓冲区（下次合成时会被覆盖）"""
+        # 不带蒙版的paste会整块覆盖像素（包括透明度），相当于清空后重画底图
+        self.buffer.paste(self.base_layer(emotion, z_count), (0, 0))
+        draw_pet_eyes(self.draw, self.spec, emotion, blink, pupil)
+        return self.buffer
+
+
+class RenderWorker:
+    """后台渲染线程：按预测的下一帧状态提前合成到后缓冲区
+
+    工作线程有自己的合成器，Tk线程只在预测命中时交换前后缓冲区并贴图，从不等待工作线程。
+    """
+
+    def __init__(self, compositor: FrameCompositor):
+        self.compositor = compositor  # 只在工作线程里使用
+        size = compositor.spec.size
+        self.back = Image.new('RGBA', (size, size), (255, 255, 255, 0))
+        self.back_key: Optional[tuple] = None  # 后缓冲区里已合成好的状态
+        self._wanted: Optional[tuple] = None
+        self._cond = threading.Condition()
+        self.running = True
+        self.rendered = 0
+        self.hits = 0
+        self.misses = 0
+        self.thread = threading.Thread(target=self._run, name='pet-render', daemon=True)
+        self.thread.start()
+
+    def request(self, key: tuple) -> None:
+        """请求提前合成某个状态（只保留最新的请求）"""
+        with self._cond:
+            if key != self.back_key and key != self._wanted:
+                self._wanted = key
+                self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self.running and self._wanted is None:
+                    self._cond.wait()
+                if not self.running:
+                    return
+                key, self._wanted = self._wanted, None
+            # 合成在锁外进行，期间Tk线程可以继续交换或请求
+            frame = self.compositor.render(*key)
+            with self._cond:
+                self.back.paste(frame, (0, 0))
+                self.back_key = key
+                self.rendered += 1
+
+    def take(self, key: tuple, front: Image.Image) -> Optional[Image.Image]:
+        """预测命中时交换缓冲区：返回合成好的帧，旧的前缓冲区交给工作线程复用；未命中返回None"""
+        with self._cond:
+            if key != self.back_key:
+                self.misses += 1
+                return None
+            frame, self.back = self.back, front
+            self.back_key = None
+            self.hits += 1
+            return frame
+
+    def close(self) -> None:
+        """停止工作线程"""
+        with self._cond:
+            self.running = False
+            self._cond.notify()
+        self.thread.join(timeout=1)
+
+    def stats(self) -> Dict[str, int]:
+        """获取预测命中统计"""
+        return {'rendered': self.rendered, 'hits': self.hits, 'misses': self.misses}
+
+
+class CrossfadeCache:
+    """表情切换的淡入淡出帧：每对表情只混合一次，之后切换表情不再有逐帧的混合开销"""
+
+    def __init__(self, stills: Dict[str, Image.Image], steps: int):
+        self.stills = stills  # 表情 -> 默认图像
+        self.steps = steps
+        self._frames: Dict[Tuple[str, str, int], Tuple[Image.Image, ...]] = {}
+
+    def frames(self, src: str, dst: str) -> Tuple[Image.Image, ...]:
+        """获取从 src 过渡到 dst 的全部中间帧（首次使用时用 Image.blend 整块混合）"""
+        key = (src, dst, self.steps)
+        frames = self._frames.get(key)
+        if frames is None:
+            a, b = self.stills[src], self.stills[dst]
+            frames = tuple(snap_alpha(Image.blend(a, b, (i + 1) / (self.steps + 1))) for i in range(self.steps))
+            self._frames[key] = frames
+        return frames
+
+    def frame(self, fade: Tuple[str, str, int]) -> Image.Image:
+        """获取一帧过渡图像"""
+        src, dst, step = fade
+        return self.frames(src, dst)[step]
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+
+class AlphaMask:
+    """由精灵透明通道预计算的位图：每个像素一位，按行打包，命中测试只需查一位
+
+    以后也可以直接用来设置窗口形状。
+    """
+
+    def __init__(self, image: Image.Image, threshold: int = ALPHA_HIT_THRESHOLD):
+        self.width, self.height = image.size
+        self.stride = (self.width + 7) // 8  # 每行的字节数
+        alpha = image.getchannel('A')
+        self.bits = alpha.point(lambda a: 255 if a >= threshold else 0, '1').tobytes()
+
+    def hit(self, x: int, y: int) -> bool:
+        """精灵坐标 (x, y) 处是否是不透明的像素"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return bool(self.bits[y * self.stride + (x >> 3)] & (0x80 >> (x & 7)))
+        return False
+
+
+class SpritePhoto:
+    """画布精灵唯一的Tk图像：新帧原地贴入，不再新建Tcl图像，也不必重新绑定到画布"""
+
+    def __init__(self, canvas, pet_sprite: int, size: int):
+        self.canvas = canvas
+        self.pet_sprite = pet_sprite
+        self.photo = ImageTk.PhotoImage('RGBA', (size, size))
+        self.bound = False
+        self.pastes = 0
+
+    def show(self, frame: Image.Image) -> int:
+        """把一帧贴入Tk图像，返回Tk调用次数"""
+        # 贴图会整块覆盖像素（包括透明度），不会和上一帧叠加
+        self.photo.paste(frame)
+        self.pastes += 1
+        if self.bound:
+            return 1
+        # 只在第一帧绑定一次
+        self.canvas.itemconfig(self.pet_sprite, image=self.photo)
+        self.bound = True
+        return 2
+
+
+class AtlasRenderer:
+    """图集渲染：每帧从图集中查出整张精灵图像
+
+    transfer 为 paste 时把图集帧贴进唯一的Tk图像；为 swap 时从LRU缓存取出对应的Tk图像再切换绑定。
+    """
+
+    def __init__(self, canvas, pet_sprite: int, atlas: SpriteAtlas, center: Tuple[int, int],
+                 transfer: str = 'paste', crossfade: Optional[CrossfadeCache] = None):
+        self.canvas = canvas
+        self.pet_sprite = pet_sprite
+        self.atlas = atlas
+        self.crossfade = crossfade
+        self.center_x, self.center_y = center
+        self.transfer = transfer
+        self.sprite_photo = SpritePhoto(canvas, pet_sprite, atlas.spec.size) if transfer == 'paste' else None
+        self.current_image = None
+
+    def draw(self, state: RenderState) -> int:
+        """推送精灵状态，返回Tk调用次数"""
+        if state.fade is not None and self.crossfade is not None:
+            # 过渡帧和图集帧走同一条推送路径
+            key = ('fade',) + state.fade
+            frame = lambda: self.crossfade.frame(state.fade)
+        else:
+            key = state.sprite_key()
+            frame = lambda: self.atlas.frames[key]
+        if self.sprite_photo is not None:
+            return self.sprite_photo.show(frame())
+        photo = self.atlas.photos.get(key, frame)
+        self.canvas.itemconfig(self.pet_sprite, image=photo)
+        # 保持引用避免被垃圾回收
+        self.current_image = photo
+        return 1
+
+    def move(self, offset: Tuple[int, int]) -> int:
+        """推送动作位移，返回Tk调用次数"""
+        self.canvas.coords(self.pet_sprite, self.center_x + offset[0], self.center_y + offset[1])
+        return 1
+
+    def destroy(self) -> None:
+        """释放渲染器（切换缩放时重建渲染器）"""
+        self.current_image = None
+        self.sprite_photo = None
+
+
+class CompositeRenderer:
+    """合成渲染：无法预渲染的状态逐帧在缓冲区里增量合成"""
+
+    def __init__(self, canvas, pet_sprite: int, compositor: FrameCompositor, center: Tuple[int, int],
+                 crossfade: Optional[CrossfadeCache] = None, worker: Optional[RenderWorker] = None):
+        self.canvas = canvas
+        self.pet_sprite = pet_sprite
+        self.center_x, self.center_y = center
+        self.compositor = compositor
+        self.crossfade = crossfade
+        self.worker = worker
+        # 前缓冲区：与工作线程交换后显示的帧
+        self.front = Image.new('RGBA', (compositor.spec.size, compositor.spec.size), (255, 255, 255, 0))
+        # 合成缓冲区和Tk图像都只有一份，逐帧原地更新
+        self.sprite_photo = SpritePhoto(canvas, pet_sprite, compositor.spec.size)
+
+    def draw(self, state: RenderState) -> int:
+        """合成并推送当前帧，返回Tk调用次数"""
+        if state.fade is not None and self.crossfade is not None:
+            return self.sprite_photo.show(self.crossfade.frame(state.fade))
+        key = (state.emotion, state.blink, state.pupil, state.zzz)
+        if self.worker is not None:
+            frame = self.worker.take(key, self.front)
+            if frame is not None:
+                # 后台已经合成好这一帧，Tk线程只需贴图
+                self.front = frame
+                return self.sprite_photo.show(frame)
+        # 没有后台线程或预测落空时在Tk线程里合成
+        return self.sprite_photo.show(self.compositor.render(*key))
+
+    def move(self, offset: Tuple[int, int]) -> int:
+        """推送动作位移，返回Tk调用次数"""
+        self.canvas.coords(self.pet_sprite, self.center_x + offset[0], self.center_y + offset[1])
+        return 1
+
+    def destroy(self) -> None:
+        """释放渲染器（切换缩放时重建渲染器）"""
+        self.sprite_photo = None
+        if self.worker is not None:
+            self.worker.close()
+
+
+class VectorPetRenderer:
+    """矢量渲染：身体、嘴巴和腮红是一张静态画布图像，眼睛是可移动的原生画布图形"""
+
+    TAG = 'pet_body'
+
+    def __init__(self, canvas, pet_sprite: int, spec: FaceSpec, base_photos: Dict[Tuple[str, int], ImageTk.PhotoImage],
+                 center: Tuple[int, int], crossfade: Optional[CrossfadeCache] = None):
+        self.canvas = canvas
+        self.pet_sprite = pet_sprite
+        self.spec = spec
+        self.crossfade = crossfade
+        self.fade_photos: Dict[tuple, ImageTk.PhotoImage] = {}  # 过渡帧的Tk图像，每帧只创建一次
+        self.center_x, self.center_y = center
+        self.offset = (0, 0)
+        self.emotion = None
+        # 每种表情的静态图层（带zzz动画的表情按帧各一张）
+        self.base_photos = base_photos
+
+        # 眼白、眼球和闭眼横线，整体带同一个标签以便一次移动
+        eye_count = max((len(eyes.whites) for eyes in spec.eyes.values() if eyes), default=0)
+        white_style = spec.eye_style['white']
+        closed_style = spec.eye_style['closed']
+        canvas.addtag_withtag(self.TAG, pet_sprite)
+        self.whites = [
+            canvas.create_oval(0, 0, 0, 0, fill=white_style.get('fill'), outline=white_style.get('outline', ''),
+                               tags=self.TAG, state='hidden')
+            for _ in range(eye_count)
+        ]
+        self.pupils = [
+            canvas.create_oval(0, 0, 0, 0, fill=spec.pupil_fill, outline='', tags=self.TAG, state='hidden')
+            for _ in range(eye_count)
+        ]
+        self.lids = [
+            canvas.create_line(0, 0, 0, 0, fill=closed_style.get('fill'), width=closed_style.get('width', 1),
+                               tags=self.TAG, state='hidden')
+            for _ in range(eye_count)
+        ]
+
+    def _origin(self) -> Tuple[float, float]:
+        """精灵左上角在画布上的坐标"""
+        return (self.center_x + self.offset[0] - self.spec.size / 2, self.center_y + self.offset[1] - self.spec.size / 2)
+
+    def draw(self, state: RenderState) -> int:
+        """只更新变化的部分，返回Tk调用次数"""
+        calls = 0
+        dirty = state.dirty
+        eyes = self.spec.eyes.get(state.emotion)
+        ox, oy = self._origin()
+
+        if state.fade is not None and self.crossfade is not None:
+            # 过渡期间整张显示混合好的图像，眼睛图形先隐藏
+            photo = self.fade_photos.get(state.fade)
+            if photo is None:
+                photo = self.fade_photos[state.fade] = ImageTk.PhotoImage(self.crossfade.frame(state.fade))
+            self.canvas.itemconfig(self.pet_sprite, image=photo)
+            if self.emotion is not None:
+                self.emotion = None
+                for item in self.whites + self.pupils + self.lids:
+                    self.canvas.itemconfig(item, state='hidden')
+                calls += len(self.whites) * 3
+            return calls + 1
+        if 'fade' in dirty:
+            # 过渡刚结束时要把底图和眼睛完整地重新摆放一次
+            dirty = dirty | {'emotion'}
+
+        if 'emotion' in dirty or 'zzz' in dirty:
+            self.canvas.itemconfig(self.pet_sprite, image=self.base_photos[(state.emotion, state.zzz)])
+            calls += 1
+        if 'emotion' in dirty and state.emotion != self.emotion:
+            self.emotion = state.emotion
+            # 换表情时先隐藏所有眼睛图形，再按新表情的形状和位置摆放
+            for item in self.whites + self.pupils + self.lids:
+                self.canvas.itemconfig(item, state='hidden')
+            calls += len(self.whites) * 3
+            if eyes is not None:
+                for item, (x0, y0, x1, y1) in zip(self.whites, eyes.whites):
+                    self.canvas.coords(item, ox + x0, oy + y0, ox + x1, oy + y1)
+                for item, (x0, y0, x1, y1) in zip(self.lids, eyes.closed):
+                    self.canvas.coords(item, ox + x0, oy + y0, ox + x1, oy + y1)
+                calls += len(eyes.whites) + len(eyes.closed)
+
+        if eyes is None:
+            # 困倦等表情没有可动的眼睛
+            return calls
+
+        count = len(eyes.whites)
+        if 'emotion' in dirty or 'blink' in dirty:
+            open_state = 'hidden' if state.blink else 'normal'
+            closed_state = 'normal' if state.blink else 'hidden'
+            for item in self.whites[:count] + self.pupils[:count]:
+                self.canvas.itemconfig(item, state=open_state)
+            for item in self.lids[:len(eyes.closed)]:
+                self.canvas.itemconfig(item, state=closed_state)
+            calls += count * 2 + len(eyes.closed)
+
+        if not state.blink and ('emotion' in dirty or 'blink' in dirty or 'pupil' in dirty):
+            px, py = state.pupil[0] * self.spec.scale, state.pupil[1] * self.spec.scale
+            for item, (x, y, r) in zip(self.pupils, eyes.pupils):
+                self.canvas.coords(item, ox + x + px - r, oy + y + py - r, ox + x + px + r, oy + y + py + r)
+            calls += len(eyes.pupils)
+        return calls
+
+    def move(self, offset: Tuple[int, int]) -> int:
+        """整体移动身体和眼睛，返回Tk调用次数"""
+        dx, dy = offset[0] - self.offset[0], offset[1] - self.offset[1]
+        self.offset = offset
+        if not dx and not dy:
+            return 0
+        self.canvas.move(self.TAG, dx, dy)
+        return 1
+
+    def destroy(self) -> None:
+        """删除眼睛图形（切换缩放时重建渲染器）"""
+        for item in self.whites + self.pupils + self.lids:
+            self.canvas.delete(item)
+        self.canvas.dtag(self.pet_sprite, self.TAG)
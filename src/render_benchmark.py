@@ -0,0 +1,74 @@
+import os
+import time
+import tracemalloc
+
+from PIL import Image, ImageDraw
+
+from pet_render import FrameCompositor, draw_pet_frame, load_face_spec, pupil_grid
+
+face_spec = load_face_spec(os.path.join("config", "appearance.yaml"))
+
+# 测试用的状态序列：各表情 × 眼球格点，夹杂眨眼帧
+emotions = ['normal', 'happy', 'sleepy', 'excited', 'thinking', 'curious']
+frames = 3000
+cells = pupil_grid(3)
+states = [
+    (emotions[i // 500 % len(emotions)], i % 40 < 4, cells[i % len(cells)], i // 5 % 4)
+    for i in range(frames)
+]
+
+
+class ImageNewCounter:
+    """统计Image.new被调用的次数（即新分配的图像缓冲区数量）"""
+
+    def __init__(self):
+        self.count = 0
+        self._original = Image.new
+
+    def __enter__(self):
+        def counting_new(*args, **kwargs):
+            self.count += 1
+            return self._original(*args, **kwargs)
+        Image.new = counting_new
+        return self
+
+    def __exit__(self, *exc):
+        Image.new = self._original
+
+
+def render_full(emotion, blink, pupil, z_count):
+    """旧方式：每帧新建图像并重画整张脸"""
+    img = Image.new('RGBA', (face_spec.size, face_spec.size), (255, 255, 255, 0))
+    draw_pet_frame(ImageDraw.Draw(img), face_spec, emotion, blink, pupil, z_count)
+    return img
+
+
+def measure(name, render):
+    """测量每帧耗时、图像缓冲区分配次数和Python内存分配峰值"""
+    # 预热一轮，让缓存类的实现进入稳定状态
+    for state in states[:len(emotions) * 500:50]:
+        render(*state)
+
+    with ImageNewCounter() as counter:
+        tracemalloc.start()
+        peak_total = 0
+        start = time.perf_counter()
+        for state in states:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            render(*state)
+            _, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - before
+        elapsed = time.perf_counter() - start
+        tracemalloc.stop()
+
+    print(f"{name}:")
+    print(f"  每帧耗时: {elapsed / frames * 1e6:.1f} µs（含tracemalloc开销）")
+    print(f"  每帧新建图像缓冲区: {counter.count / frames:.2f} 个")
+    print(f"  每帧Python内存分配峰值: {peak_total / frames:.0f} 字节")
+
+
+if __name__ == "__main__":
+    print(f"渲染 {frames} 帧 {face_spec.size}x{face_spec.size} 宠物图像\n")
+    measure("整帧重画（优化前）", render_full)
+    measure("增量合成（优化后）", FrameCompositor(face_spec).render)
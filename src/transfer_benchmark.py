@@ -0,0 +1,114 @@
+import os
+import time
+import tkinter as tk
+
+from PIL import Image, ImageTk
+
+from pet_render import FrameCompositor, SpriteAtlas, load_face_spec, pupil_grid
+
+face_spec = load_face_spec(os.path.join("config", "appearance.yaml"))
+
+# 测试用的状态序列：各表情 × 眼球格点，夹杂眨眼帧
+emotions = ['normal', 'happy', 'sleepy', 'excited', 'thinking', 'curious']
+frames = 3000
+cells = pupil_grid(3)
+states = [
+    face_spec.normalize_key(emotions[i // 500 % len(emotions)], i % 40 < 4, cells[i % len(cells)], i // 5 % 4)
+    for i in range(frames)
+]
+
+
+def new_photo_per_frame(canvas, sprite, frame_source):
+    """旧方式：每帧新建一张Tk图像并重新绑定到画布"""
+    holder = []
+
+    def push(state):
+        photo = ImageTk.PhotoImage(frame_source(state))
+        canvas.itemconfig(sprite, image=photo)
+        holder[:] = [photo]
+    return push
+
+
+def cached_photo_swap(canvas, sprite, frame_source):
+    """图集的swap方式：每个状态一张缓存的Tk图像，逐帧切换绑定"""
+    photos = {}
+
+    def push(state):
+        photo = photos.get(state)
+        if photo is None:
+            photo = photos[state] = ImageTk.PhotoImage(frame_source(state))
+        canvas.itemconfig(sprite, image=photo)
+    return push
+
+
+def paste_in_place(canvas, sprite, frame_source):
+    """paste方式：唯一的Tk图像，逐帧原地贴入像素"""
+    photo = ImageTk.PhotoImage('RGBA', (face_spec.size, face_spec.size))
+    canvas.itemconfig(sprite, image=photo)
+
+    def push(state):
+        photo.paste(frame_source(state))
+    push.photo = photo
+    return push
+
+
+def ppm_put(canvas, sprite, frame_source):
+    """PPM数据方式：先压到白色背景上（白色即窗口透明色），再把二进制PPM直接交给Tk"""
+    photo = tk.PhotoImage(width=face_spec.size, height=face_spec.size)
+    canvas.itemconfig(sprite, image=photo)
+    background = Image.new('RGBA', (face_spec.size, face_spec.size), 'white')
+    header = f"P6 {face_spec.size} {face_spec.size} 255 ".encode('ascii')
+
+    def push(state):
+        flat = Image.alpha_composite(background, frame_source(state)).convert('RGB')
+        photo.put(header + flat.tobytes())
+    push.photo = photo
+    return push
+
+
+def measure(root, name, push):
+    """测量每核每秒推送的帧数（按进程CPU时间计算，包括Tk的画布重绘）"""
+    for state in states[:len(emotions) * 500:50]:
+        push(state)
+        root.update_idletasks()
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for state in states:
+        push(state)
+        # 让Tk把这一帧真正画到屏幕上
+        root.update_idletasks()
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    print(f"  {name}: {frames / cpu:8.0f} 帧/秒/核（墙钟 {frames / wall:.0f} 帧/秒）")
+
+
+if __name__ == "__main__":
+    root = tk.Tk()
+    canvas = tk.Canvas(root, width=face_spec.size, height=face_spec.size, bg='white', highlightthickness=0)
+    canvas.pack()
+    sprite = canvas.create_image(face_spec.size // 2, face_spec.size // 2)
+    root.update()
+
+    atlas = SpriteAtlas(face_spec, emotions).build()
+    compositor = FrameCompositor(face_spec)
+    sources = [
+        ("图集帧", lambda state: atlas.frames[state]),
+        ("增量合成帧", lambda state: compositor.render(*state)),
+    ]
+    strategies = [
+        ("每帧新建Tk图像", new_photo_per_frame),
+        ("切换缓存的Tk图像", cached_photo_swap),
+        ("原地paste", paste_in_place),
+        ("PPM数据put", ppm_put),
+    ]
+
+    print(f"推送 {frames} 帧 {face_spec.size}x{face_spec.size} 宠物图像到Tk\n")
+    for source_name, frame_source in sources:
+        print(f"{source_name}:")
+        for name, strategy in strategies:
+            if strategy is cached_photo_swap and source_name != "图集帧":
+                # 按状态缓存合成帧就等于图集，不重复测量
+                continue
+            measure(root, name, strategy(canvas, sprite, frame_source))
+    root.destroy()
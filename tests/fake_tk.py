@@ -0,0 +1,189 @@
+import functools
+import itertools
+import os
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+# 执行回调数量的上限，超过说明有回调在零延迟里反复排期
+MAX_CALLBACKS = 100000
+
+
+class FakeRoot:
+    """假的Tk根窗口：记录每一次 after 调度，按虚拟时间（毫秒）手动执行"""
+
+    def __init__(self):
+        self.pending = {}  # after id -> (到期的虚拟时间, 回调, 参数)
+        self.scheduled = 0  # after 调用的总次数
+        self.now = 0
+        self.position = (100, 100)  # 窗口位置
+        self.pointer = (0, 0)  # 光标的屏幕坐标
+        self._ids = itertools.count(1)
+
+    def clock(self) -> float:
+        """虚拟时间（秒），传给帧时钟和动画时钟"""
+        return self.now / 1000
+
+    def after(self, ms, func=None, *args):
+        self.scheduled += 1
+        after_id = f"after#{next(self._ids)}"
+        self.pending[after_id] = (self.now + ms, func, args)
+        return after_id
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_until(self, t):
+        """按到期顺序执行虚拟时间 t 之前的所有回调，返回执行的数量"""
+        ran = 0
+        while True:
+            due = [(when, after_id) for after_id, (when, _, _) in self.pending.items() if when <= t]
+            if not due:
+                break
+            if ran >= MAX_CALLBACKS:
+                raise AssertionError(f"{t}ms 之前执行了超过 {MAX_CALLBACKS} 个回调")
+            when, after_id = min(due)
+            _, func, args = self.pending.pop(after_id)
+            self.now = max(self.now, when)
+            func(*args)
+            ran += 1
+        self.now = t
+        return ran
+
+    def advance(self, ms):
+        """虚拟时间前进 ms 毫秒"""
+        return self.run_until(self.now + ms)
+
+    # 窗口相关的调用都不需要真正执行
+    def winfo_screenwidth(self):
+        return 1920
+
+    def winfo_screenheight(self):
+        return 1080
+
+    def winfo_x(self):
+        return self.position[0]
+
+    def winfo_y(self):
+        return self.position[1]
+
+    def winfo_rootx(self):
+        return self.position[0]
+
+    def winfo_rooty(self):
+        return self.position[1]
+
+    def winfo_fpixels(self, spec):
+        return 96.0
+
+    def winfo_pointerxy(self):
+        return self.pointer
+
+    def attributes(self, *args):
+        return True
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class FakeCanvas:
+    """假的画布：只分配元素编号，记下绑定的事件回调"""
+
+    def __init__(self, *args, **kwargs):
+        self._ids = itertools.count(1)
+        self.bindings = {}
+
+    def _create(self, *args, **kwargs):
+        return next(self._ids)
+
+    create_image = create_oval = create_line = create_rectangle = create_polygon = create_text = _create
+
+    def bind(self, sequence, func):
+        self.bindings[sequence] = func
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class FakePhotoImage:
+    """假的PhotoImage：不需要显示器"""
+
+    def __init__(self, image=None, size=None, **kwargs):
+        # 和ImageTk一样支持 PhotoImage(image) 和 PhotoImage(mode, size) 两种写法
+        self.size = size if isinstance(image, str) else image.size
+
+    def paste(self, image, *args):
+        pass
+
+    def width(self):
+        return self.size[0]
+
+    def height(self):
+        return self.size[1]
+
+
+class FakeEvent:
+    """假的Tk事件：画布坐标和屏幕坐标"""
+
+    def __init__(self, x, y, x_root=0, y_root=0):
+        self.x, self.y, self.x_root, self.y_root = x, y, x_root, y_root
+
+
+def fake_modules(root):
+    """构造假的 tkinter 和 pystray 模块"""
+    tkinter = types.ModuleType('tkinter')
+    tkinter.Tk = lambda: root
+    tkinter.Canvas = FakeCanvas
+    tkinter.Menu = FakeCanvas
+    tkinter.messagebox = types.SimpleNamespace(showerror=lambda *args: None)
+    pystray = types.ModuleType('pystray')
+    pystray.Icon = FakeCanvas
+    pystray.MenuItem = lambda *args, **kwargs: None
+    pystray.Menu = type('Menu', (), {'SEPARATOR': None, '__init__': lambda self, *args: None})
+    return {'tkinter': tkinter, 'tkinter.messagebox': tkinter.messagebox, 'pystray': pystray}
+
+
+class PetTestCase(unittest.TestCase):
+    """在假的Tk上创建桌面宠物，所有时钟都跑在根窗口的虚拟时间上"""
+
+    def setUp(self):
+        from PIL import ImageTk
+
+        self.root = FakeRoot()
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        for patcher in (
+            mock.patch.dict(sys.modules, fake_modules(self.root)),
+            mock.patch.dict(os.environ, {'XDG_CACHE_HOME': cache_dir.name}),
+            mock.patch.object(ImageTk, 'PhotoImage', FakePhotoImage),
+            mock.patch.object(sys, 'path', [SRC_DIR] + sys.path),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # 配置文件按工作目录查找
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(os.path.dirname(SRC_DIR))
+        sys.modules.pop('main', None)
+        self.addCleanup(sys.modules.pop, 'main', None)
+
+        import main
+        self.main = main
+        clock = self.root.clock
+        # 空闲计时用的 time.time 也换成虚拟时间
+        main.time = types.SimpleNamespace(time=lambda: 1e6 + clock())
+        main.FrameClock = functools.partial(main.FrameClock, clock=clock)
+        main.AnimationClock = functools.partial(main.AnimationClock, clock=clock)
+        main.PointerSampler = functools.partial(main.PointerSampler, clock=clock)
+        main.WindowDrag = functools.partial(main.WindowDrag, clock=clock)
+        self.pet = main.DesktopPet()
+
+    def pet_center(self):
+        """宠物身体中心的画布坐标"""
+        return self.pet.pet_size // 2, self.pet.total_height - self.pet.pet_size // 2
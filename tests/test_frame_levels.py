@@ -0,0 +1,41 @@
+import unittest
+
+from fake_tk import PetTestCase
+
+
+class EyeTrackingLevelTest(PetTestCase):
+    """眼球跟随屏幕上的光标时不应把帧率拉到active档"""
+
+    def move_cursor_far_away(self, seconds):
+        """光标在离宠物很远的地方持续移动，返回经过的帧率档位"""
+        levels = set()
+        for i in range(seconds * 30):
+            self.root.pointer = (1500 + i, 900 - i // 2)
+            self.root.advance(33)
+            levels.add(self.pet.frame_governor.level)
+        return levels
+
+    def test_distant_cursor_stays_below_active(self):
+        self.root.advance(12000)
+        eyes = next(subsystem for subsystem in self.pet.frame_clock.subsystems if subsystem.name == 'eyes')
+        calls = eyes.calls
+
+        levels = self.move_cursor_far_away(10)
+        self.assertNotIn('active', levels)
+        # 最多按awake档的帧率运行
+        self.assertLessEqual(eyes.calls - calls, 10000 // self.pet.frame_governor.levels['awake'] + 1)
+
+    def test_pupil_still_follows_cursor(self):
+        self.root.advance(12000)
+        self.move_cursor_far_away(1)
+        self.root.advance(2000)
+        self.assertTrue(self.pet.pupil_spring.converged)
+        target = self.pet.compute_pupil_target(self.pet.current_emotion, self.pet.mouse_x, self.pet.mouse_y)
+        # 渲染状态在眨眼时会折叠掉眼球位置，直接比较弹簧的位置
+        snap = self.main.snap_pupil
+        radius = self.pet.eye_max_radius
+        self.assertEqual(snap(*self.pet.pupil_spring.position, radius), snap(*target, radius))
+
+
+if __name__ == '__main__':
+    unittest.main()
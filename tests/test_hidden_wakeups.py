@@ -0,0 +1,48 @@
+import unittest
+
+from fake_tk import PetTestCase
+
+
+class HiddenWakeupsTest(PetTestCase):
+    """隐藏到托盘后不应再有任何 after 回调"""
+
+    def test_hide_to_tray_leaves_nothing_scheduled(self):
+        # 先正常运行一段时间，让帧时钟和定时器都挂上回调
+        self.root.advance(5000)
+        self.assertTrue(self.root.pending)
+
+        self.pet.hide_to_tray()
+        self.assertEqual(self.root.pending, {})
+
+        scheduled = self.root.scheduled
+        wakeups = self.pet.frame_clock.wakeups
+        self.assertEqual(self.root.advance(60000), 0)
+        self.assertEqual(self.root.scheduled - scheduled, 0)
+        self.assertEqual(self.pet.frame_clock.wakeups - wakeups, 0)
+
+    def test_idle_wakeups_follow_frame_interval(self):
+        # 空闲档位下帧时钟按帧间隔唤醒，光标轮询退避到最长间隔，不会在零延迟里空转
+        self.root.advance(12000)
+        self.assertEqual(self.pet.frame_governor.level, 'idle')
+        scheduled = self.root.scheduled
+        wakeups = self.pet.frame_clock.wakeups
+
+        self.root.advance(10000)
+        self.assertEqual(self.pet.frame_governor.level, 'idle')
+        # 周期性的唤醒在时间窗两端各可能多落一次
+        frames = 10000 // self.pet.frame_clock.frame_interval + 1
+        polls = 10000 // self.pet.cursor_poller.max_interval + 1
+        # 每次 after 都是帧时钟的一次唤醒，没有其他周期回调
+        self.assertEqual(self.root.scheduled - scheduled, self.pet.frame_clock.wakeups - wakeups)
+        self.assertLessEqual(self.root.scheduled - scheduled, frames + polls)
+
+    def test_show_pet_resumes_frame_clock(self):
+        self.root.advance(1000)
+        self.pet.hide_to_tray()
+        self.pet.show_pet()
+        self.assertTrue(self.root.pending)
+        self.assertGreater(self.root.advance(3000), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from fake_tk import FakeEvent, PetTestCase
+
+
+class HoverTest(PetTestCase):
+    """悬停状态跟随指针进出宠物"""
+
+    def send(self, sequence, x, y):
+        """把事件交给画布上绑定的回调"""
+        self.pet.canvas.bindings[sequence](FakeEvent(x, y))
+
+    def test_leave_after_motion_on_body(self):
+        self.root.advance(1000)
+        x, y = self.pet_center()
+        # 快速划过：进入画布边缘，移到身上，紧接着离开画布，中间没有帧
+        self.send('<Enter>', 0, 0)
+        self.send('<Motion>', x, y)
+        self.assertTrue(self.pet.mouse_over)
+        self.send('<Leave>', -5, y)
+        self.assertFalse(self.pet.mouse_over)
+
+        # 下一帧的采样不能再用离开前那个画布内的坐标
+        self.root.advance(100)
+        self.assertFalse(self.pet.mouse_over)
+
+        # 之后照常降回空闲档位
+        self.root.advance(120000)
+        self.assertFalse(self.pet.mouse_over)
+        self.assertNotEqual(self.pet.frame_governor.level, 'active')
+
+    def test_points_outside_canvas_are_not_over(self):
+        self.root.advance(1000)
+        x, y = self.pet_center()
+        self.pet.update_hover(FakeEvent(x, y))
+        self.assertTrue(self.pet.mouse_over)
+        self.pet.update_hover(FakeEvent(x, -1))
+        self.assertFalse(self.pet.mouse_over)
+        self.pet.update_hover(FakeEvent(self.pet.pet_size, y))
+        self.assertFalse(self.pet.mouse_over)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+from fake_tk import FakeEvent, PetTestCase
+
+
+class DragStatsTest(PetTestCase):
+    """拖拽延迟通过 get_stats 报告"""
+
+    def test_drag_latency_is_reported(self):
+        self.root.advance(1000)
+        x, y = self.pet_center()
+        bindings = self.pet.canvas.bindings
+        bindings['<Button-1>'](FakeEvent(x, y, 500, 500))
+        # 一帧里来几个移动事件，窗口每帧最多移动一次
+        for step in range(1, 31):
+            bindings['<B1-Motion>'](FakeEvent(x, y, 500 + step * 4, 500 + step * 2))
+            if step % 3 == 0:
+                self.root.advance(33)
+        bindings['<ButtonRelease-1>'](FakeEvent(x, y, 620, 560))
+
+        drag = self.pet.get_stats()['drag']
+        self.assertEqual(drag['events'], 10)
+        self.assertEqual(drag['moves'], 10)
+        # 事件最晚在下一帧生效
+        self.assertLessEqual(drag['max_latency_ms'], self.pet.frame_governor.levels['active'] + 1)
+        self.assertGreater(drag['avg_latency_ms'], 0)
+
+    def test_stats_cover_subsystems(self):
+        self.root.advance(1000)
+        stats = self.pet.get_stats()
+        for name in ('frame_clock', 'timers', 'render', 'particles', 'pointer', 'drag'):
+            self.assertIn(name, stats)
+        self.assertIn('eyes', stats['frame_clock'])
+        self.assertEqual(stats['frame_level'], self.pet.frame_governor.level)
+
+
+if __name__ == '__main__':
+    unittest.main()